@@ -0,0 +1,82 @@
+"""Measures per-student memory of gradebooks held in RAM, with and without interning.
+
+Run with ``python benchmarks/bench_memory.py [-n STUDENTS]``. Strings are
+rebuilt for every student, as they are when parsed from separate responses.
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+from typing import Any, List, Optional
+import skyward_api.intern
+from skyward_api.assignment import Assignment
+from skyward_api.skyward_class import SkywardClass
+
+TEACHERS = ["TEACHER {0}".format(number) for number in range(40)]
+CLASSES = ["CLASS {0}".format(number) for number in range(30)]
+LETTERS = ["A", "B", "C", "D", "F", "*"]
+
+class NoInterning():
+    def intern(self, value: Any) -> Any:
+        return value
+
+def fresh(value: str) -> str:
+    return "".join(list(value))
+
+def make_student(rand: random.Random) -> List[SkywardClass]:
+    classes = []
+    for period in range(1, 8):
+        for semester in (1, 2):
+            title = "{0} (Period {1}) {2}".format(
+                rand.choice(CLASSES),
+                period,
+                rand.choice(TEACHERS)
+            )
+            sky_class = SkywardClass(fresh(title), [])
+            for number in range(25):
+                total = rand.choice([10, 20, 50, 100])
+                sky_class.add_grade(Assignment(
+                    fresh("Assignment {0}".format(number)),
+                    fresh(str(rand.randint(0, total))),
+                    fresh(str(total)),
+                    fresh(rand.choice(LETTERS)),
+                    fresh("{0:02d}/{1:02d}/18".format(
+                        rand.randint(8, 12) if semester == 1 else rand.randint(1, 5),
+                        rand.randint(1, 28)
+                    ))
+                ))
+            classes.append(sky_class)
+    return classes
+
+def measure(students: int, interning: bool) -> float:
+    table = skyward_api.intern.strings
+    if not interning:
+        skyward_api.intern.strings = NoInterning() # type: ignore
+    table.clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        rand = random.Random(0)
+        batch = [make_student(rand) for _ in range(students)]
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        skyward_api.intern.strings = table
+    del batch
+    return size / students
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--students", type=int, default=500)
+    args = parser.parse_args(argv)
+    plain = measure(args.students, False)
+    interned = measure(args.students, True)
+    print("without interning {0:8.1f} KiB/student".format(plain / 1024))
+    print("with interning    {0:8.1f} KiB/student ({1:.0%} of plain)".format(
+        interned / 1024,
+        interned / plain
+    ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compares snapshot round-trips against get_grades_json-style JSON and pickle.
+
+Run with ``python benchmarks/bench_snapshot.py``.
+"""
+import json
+import pickle
+import random
+import timeit
+from typing import Any, Callable, Dict, List
+from skyward_api import snapshot
+from skyward_api.assignment import Assignment
+from skyward_api.skyward_class import SkywardClass
+
+def make_gradebook(n_classes: int = 14, n_grades: int = 40) -> List[SkywardClass]:
+    rand = random.Random(0)
+    letters = ["A", "B", "C", "D", "F", "*"]
+    classes = []
+    for period in range(n_classes):
+        sky_class = SkywardClass(
+            "CLASS {0} (Period {1}) TEACHER {2}".format(period, period + 1, period % 7),
+            []
+        )
+        for number in range(n_grades):
+            total = rand.choice([10, 20, 50, 100])
+            earned = rand.randint(0, total)
+            sky_class.add_grade(Assignment(
+                "Assignment {0}".format(number),
+                str(earned),
+                str(total),
+                rand.choice(letters),
+                "{0:02d}/{1:02d}/18".format(rand.randint(9, 12), rand.randint(1, 28))
+            ))
+        classes.append(sky_class)
+    return classes
+
+def to_json(classes: List[SkywardClass]) -> bytes:
+    json_grades = {} # type: Dict[str, List[Dict[str, Any]]]
+    for sky_class in classes:
+        json_grades.setdefault(sky_class.skyward_title(), []).extend(
+            grade.__dict__ for grade in sky_class.grades
+        )
+    return json.dumps(json_grades).encode("utf-8")
+
+def from_json(data: bytes) -> List[SkywardClass]:
+    return [
+        SkywardClass(title, [Assignment(**grade) for grade in grades])
+        for title, grades in json.loads(data.decode("utf-8")).items()
+    ]
+
+def bench(name: str, dump: Callable, load: Callable, classes: List[SkywardClass]) -> None:
+    data = dump(classes)
+    number = 100
+    dump_times = timeit.repeat(lambda: dump(classes), number=number, repeat=5)
+    load_times = timeit.repeat(lambda: load(data), number=number, repeat=5)
+    dump_time = min(dump_times) / number
+    load_time = min(load_times) / number
+    print("{0:<10} {1:>8} bytes  dumps {2:8.1f} us  loads {3:8.1f} us".format(
+        name,
+        len(data),
+        dump_time * 1e6,
+        load_time * 1e6
+    ))
+
+def main() -> None:
+    classes = make_gradebook()
+    assert snapshot.loads(snapshot.dumps(classes))[0].grades == classes[0].grades
+    bench("json", to_json, from_json, classes)
+    bench("pickle", pickle.dumps, pickle.loads, classes)
+    bench("snapshot", snapshot.dumps, snapshot.loads, classes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Compares SkywardAPI transports on many small POSTs, like httploader.p requests.
+
+Run with ``python benchmarks/bench_transport.py [URL]``. Without a URL a local
+HTTPS server that answers after ``--latency`` seconds stands in for Skyward.
+It negotiates HTTP/2 or HTTP/1.1 with ALPN, so each transport runs over TLS
+with the protocol it would use against Skyward, and both are driven by the
+same number of threads (``--concurrency``). The server needs the ``h2``
+package (installed with ``httpx[http2]``) and the ``openssl`` command for its
+throwaway certificate. Do not point it at a production Skyward service.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+from skyward_api.API import SkywardAPI
+from skyward_api.transport import HTTP2Transport
+
+BODY = b"<data><![CDATA[<div class='gb_heading'>CLASS</div>]]></data>"
+
+async def serve_http1(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    latency: float
+) -> None:
+    while True:
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in head.split(b"\r\n"):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value)
+        await reader.readexactly(length)
+        await asyncio.sleep(latency)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/xml\r\n"
+            b"Content-Length: " + str(len(BODY)).encode() + b"\r\n\r\n" + BODY
+        )
+        await writer.drain()
+
+async def serve_h2(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    latency: float
+) -> None:
+    import h2.config
+    import h2.connection
+    import h2.events
+
+    connection = h2.connection.H2Connection(
+        h2.config.H2Configuration(client_side=False)
+    )
+    connection.initiate_connection()
+    writer.write(connection.data_to_send())
+
+    async def respond(stream_id: int) -> None:
+        await asyncio.sleep(latency)
+        connection.send_headers(stream_id, [
+            (":status", "200"),
+            ("content-type", "text/xml"),
+            ("content-length", str(len(BODY)))
+        ])
+        connection.send_data(stream_id, BODY, end_stream=True)
+        writer.write(connection.data_to_send())
+
+    tasks = set()
+    while True:
+        data = await reader.read(65536)
+        if not data:
+            return
+        for event in connection.receive_data(data):
+            if isinstance(event, h2.events.DataReceived):
+                connection.acknowledge_received_data(
+                    event.flow_controlled_length,
+                    event.stream_id
+                )
+            elif isinstance(event, h2.events.StreamEnded):
+                task = asyncio.ensure_future(respond(event.stream_id))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        writer.write(connection.data_to_send())
+
+def make_certificate(directory: str) -> Dict[str, str]:
+    paths = {
+        "cert": os.path.join(directory, "cert.pem"),
+        "key": os.path.join(directory, "key.pem")
+    }
+    subprocess.run([
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+        "-keyout", paths["key"], "-out", paths["cert"], "-days", "1",
+        "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1"
+    ], check=True, capture_output=True)
+    return paths
+
+def serve(latency: float, directory: str) -> str:
+    paths = make_certificate(directory)
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(paths["cert"], paths["key"])
+    context.set_alpn_protocols(["h2", "http/1.1"])
+    # Both clients find the certificate through their usual environment
+    # variables, so the transports run unmodified.
+    os.environ["REQUESTS_CA_BUNDLE"] = paths["cert"]
+    os.environ["SSL_CERT_FILE"] = paths["cert"]
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        protocol = writer.get_extra_info("ssl_object").selected_alpn_protocol()
+        try:
+            if protocol == "h2":
+                await serve_h2(reader, writer, latency)
+            else:
+                await serve_http1(reader, writer, latency)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(
+        asyncio.start_server(handle, "127.0.0.1", 0, ssl=context)
+    )
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    port = server.sockets[0].getsockname()[1]
+    return "https://127.0.0.1:{0}/httploader.p".format(port)
+
+def bench(transport: str, url: str, requests: int, concurrency: int) -> float:
+    if transport == "http2":
+        transport_option = HTTP2Transport(max_concurrency=concurrency) # type: Any
+    else:
+        transport_option = transport
+    api = SkywardAPI("bench", thread_safe=True, transport=transport_option)
+    data = {"action": "viewGradeInfoDialog", "bucket": "SEM 1"}
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(
+            lambda _: api.timed_request(url, data=data),
+            range(requests)
+        ))
+    elapsed = time.perf_counter() - start
+    api.transport.close()
+    return elapsed
+
+def main(argv: Optional[Any] = None) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("url", nargs="?", default=None)
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.url or serve(args.latency, directory)
+        for transport in ("session", "http2"):
+            elapsed = bench(transport, url, args.requests, args.concurrency)
+            print("{0:<8} {1} requests in {2:.2f}s ({3:.1f} ms/request)".format(
+                transport,
+                args.requests,
+                elapsed,
+                elapsed / args.requests * 1000
+            ))
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,61 @@
 from requests_html import HTMLSession, HTML, Element, HTMLResponse, MaxRetries
 from skyward_api.assignment import Assignment
+from skyward_api.deadline import Deadline
+from skyward_api.errors import SkywardError, SessionError, DeadlineExceeded
+from skyward_api.grade_buttons import GradeButton, GradeButtonIndex
+from skyward_api.gradebook import Gradebook
 from skyward_api.helpers import parse_login_text, skyward_req_conf
+from skyward_api.profiling import SamplingProfiler
+from skyward_api.resources import ResourceMonitor
 from skyward_api.skyward_class import SkywardClass
+from skyward_api.transport import Transport, make_transport
 import requests
+import asyncio
+import concurrent.futures
+import contextlib
 import getpass
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple, Union
 import re
 import time
 import lxml
 import psutil
+import pyppeteer
+import threading
 
-class SkywardError(RuntimeError):
-    def __init__(self, message: str) -> None:
-        super().__init__(message)
+class ThreadSession(HTMLSession):
+    """HTMLSession that can render outside the main thread.
 
-class SessionError(SkywardError):
-    def __init__(self, message: str) -> None:
-        super().__init__(message)
+    Gives each thread that renders its own event loop, and launches Chromium
+    without installing signal handlers (which only the main thread may do).
+
+    Parameters
+    ----------
+    browser_args : List[str]
+        Arguments for Chromium (the default is ["--no-sandbox"]).
+
+    """
+    def __init__(self, browser_args: List[str] = ["--no-sandbox"], **kwargs: Any) -> None:
+        super().__init__(browser_args=browser_args, **kwargs)
+        self.browser_args = browser_args
+
+    @property
+    def browser(self) -> Any:
+        if not hasattr(self, "_browser"):
+            try:
+                self.loop = asyncio.get_event_loop()
+            except RuntimeError:
+                self.loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(self.loop)
+            self._browser = self.loop.run_until_complete(pyppeteer.launch(
+                ignoreHTTPSErrors=not self.verify,
+                headless=True,
+                args=self.browser_args,
+                handleSIGINT=False,
+                handleSIGTERM=False,
+                handleSIGHUP=False
+            ))
+        return self._browser
 
 class SkywardAPI():
     """Class for Skyward data retrieval.
@@ -28,6 +66,35 @@ class SkywardAPI():
         Skyward service for school.
     timout: int
         Request timeout (the default is 60)
+    thread_safe : bool
+        Whether the api may be shared between threads (the default is False).
+    monitor : Optional[ResourceMonitor]
+        Monitor that tracks get_grades and from_session_data and enforces its
+        limits after them. May be shared by a batch of apis (the default is
+        None).
+    transport : Union[str, Transport]
+        How requests are sent: "session" for a fresh HTMLSession per request,
+        "http2" for a persistent HTTP/2 client, shared by every api created
+        this way, that multiplexes requests and fetches classes in parallel,
+        or a Transport instance (which may be shared between apis) (the
+        default is "session").
+    profiler : Optional[SamplingProfiler]
+        Profiler that samples a fraction of login, get_grades and
+        from_session_data calls. May be shared by a batch of apis (the default
+        is None).
+
+    Notes
+    -----
+    Network methods take an optional ``deadline``. Passing one Deadline through
+    a whole call (e.g. from_username_password followed by get_grades) bounds the
+    total time of every request, retry and render it makes; when the budget
+    runs out DeadlineExceeded is raised with the time spent in each stage.
+
+    With ``thread_safe=True`` one api can serve many threads at once: every
+    thread gets its own HTMLSession (and event loop for rendering), and
+    setup is serialized so concurrent logins cannot mix up login_data. The
+    api never writes to module-level state, so separate apis (e.g. one per
+    account, or one per service used only for login) are always independent.
 
     Attributes
     ----------
@@ -39,18 +106,106 @@ class SkywardAPI():
         URL for login.
     session_params : Dict[str, Any]
         Parameters for session.
+    thread_safe : bool
+        Whether the api may be shared between threads.
+    monitor : Optional[ResourceMonitor]
+        Resource monitor for the api's calls.
+    transport : Transport
+        Transport requests are sent with.
+    profiler : Optional[SamplingProfiler]
+        Sampling profiler for the api's calls.
+    session : HTMLSession
+        Session requests are made with (per thread if thread_safe).
 
     """
     def __init__(
         self,
         service: str,
-        timeout: int = 60
+        timeout: int = 60,
+        thread_safe: bool = False,
+        monitor: Optional[ResourceMonitor] = None,
+        transport: Union[str, Transport] = "session",
+        profiler: Optional[SamplingProfiler] = None
     ) -> None:
         self.base_url = "https://skyward.iscorp.com/scripts/wsisa.dll/WService={0}".format(service)
         self.login_url = self.base_url + "/skyporthttp.w"
         self.timeout = timeout
         self.session_params = {} # type: Dict[str, str]
-        self.session = HTMLSession()
+        self.thread_safe = thread_safe
+        self.monitor = monitor
+        self.profiler = profiler
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._session = None # type: Optional[HTMLSession]
+        self._grade_buttons = None # type: Optional[Tuple[int, int, GradeButtonIndex]]
+        self.session = self.new_session()
+        self.transport = make_transport(transport, self)
+
+    def new_session(self) -> HTMLSession:
+        """Creates a session suited to the api's threading mode.
+
+        Returns
+        -------
+        HTMLSession
+            A ThreadSession if thread_safe, otherwise an HTMLSession.
+
+        """
+        if self.thread_safe:
+            return ThreadSession()
+        return HTMLSession()
+
+    def track(self, stage: str) -> Any:
+        """Tracks resources used by a block with the api's monitor.
+
+        Parameters
+        ----------
+        stage : str
+            Name the block is recorded under.
+
+        Returns
+        -------
+        ContextManager
+            Context manager wrapping the block; does nothing without a monitor.
+
+        """
+        if self.monitor is None:
+            return contextlib.ExitStack()
+        return self.monitor.track(stage)
+
+    def profile(self, call: str) -> Any:
+        """Samples a block with the api's profiler, if this call is picked.
+
+        Parameters
+        ----------
+        call : str
+            Name the block's samples are recorded under.
+
+        Returns
+        -------
+        ContextManager
+            Context manager wrapping the block; does nothing without a profiler.
+
+        """
+        if self.profiler is None:
+            return contextlib.ExitStack()
+        return self.profiler.profile(call)
+
+    @property
+    def session(self) -> HTMLSession:
+        if not self.thread_safe:
+            return self._session
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.new_session()
+            self._local.session = session
+        return session
+
+    @session.setter
+    def session(self, session: HTMLSession) -> None:
+        if self.thread_safe:
+            self._local.session = session
+        else:
+            self._session = session
 
     def edit_srcs(self, page: HTMLResponse) -> HTML:
         """Edits urls in page to request from Skyward and not local computer.
@@ -93,7 +248,8 @@ class SkywardAPI():
         data: Dict[str, str] = {},
         headers: Dict[str, str] = {},
         method: str = "post",
-        params: Dict[str, str] = {}
+        params: Dict[str, str] = {},
+        deadline: Optional[Deadline] = None
     ) -> HTMLResponse:
         """Issues a requests-html request with timeout functionality. Automatically
             closes session at end of request.
@@ -110,6 +266,8 @@ class SkywardAPI():
             Method of request (the default is "post").
         params : Dict[str, str]
             Params for request (the default is {}).
+        deadline : Optional[Deadline]
+            Budget for the request and its retries (the default is None).
 
         Returns
         -------
@@ -120,34 +278,45 @@ class SkywardAPI():
         -------
         SkywardError
             Unable to connect to skyward.
+        DeadlineExceeded
+            deadline ran out before a response arrived.
 
         Side Effects
         ------------
-        Closes self.session and regenerates it.
+        With the session transport, closes self.session and regenerates it.
         """
+        if deadline is None:
+            deadline = Deadline()
         start_time = time.time()
         return_data = None
         while True:
+            deadline.check()
             try:
-                return_data = self.session.request(
+                return_data = self.transport.request(
                     method,
                     url,
-                    data=data,
-                    headers=headers,
-                    params=params
+                    data,
+                    headers,
+                    params,
+                    deadline.request_timeout()
                 )
                 break
             except requests.exceptions.ConnectionError:
                 if time.time() > start_time + self.timeout:
                     raise SkywardError('Request to Skyward failed.')
                 else:
-                    time.sleep(1)
-            finally:
-                self.session.close()
-                self.session = HTMLSession()
+                    deadline.sleep(1)
+            except requests.exceptions.Timeout:
+                deadline.check()
+                # Only reachable if the clock raced the request timeout.
         return return_data
 
-    def login(self, username: str, password: str) -> Dict[str, Any]:
+    def login(
+        self,
+        username: str,
+        password: str,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
         """Logs into Skyward and retreives session data.
 
         Parameters
@@ -156,6 +325,8 @@ class SkywardAPI():
             Skyward username.
         password: str
             Skyward password.
+        deadline : Optional[Deadline]
+            Budget for logging in (the default is None).
 
         Returns
         -------
@@ -168,19 +339,32 @@ class SkywardAPI():
             Incorrect username or password.
         SkywardError
             Unable to connect to Skyward.
+        DeadlineExceeded
+            deadline ran out.
 
         """
-        params = skyward_req_conf
+        if deadline is None:
+            deadline = Deadline()
+        with self.profile("login"), deadline.stage("login"):
+            return self._login(username, password, deadline)
+
+    def _login(
+        self,
+        username: str,
+        password: str,
+        deadline: Deadline
+    ) -> Dict[str, Any]:
+        params = dict(skyward_req_conf)
         params["codeValue"] = username
         params["login"] = username
         params["password"] = password
-        req = self.timed_request(self.login_url, data=params)
+        req = self.timed_request(self.login_url, data=params, deadline=deadline)
         text = req.html.text
         if "Invalid" in text:
             raise ValueError("Incorrect username or password")
         times = 0
         while text == "" and times <= 5:
-            req = self.timed_request(self.login_url, data=params)
+            req = self.timed_request(self.login_url, data=params, deadline=deadline)
             text = req.html.text
             times += 1
             """
@@ -193,7 +377,12 @@ class SkywardAPI():
         data = parse_login_text(self.base_url, text)
         return data
 
-    def setup(self, username: str, password: str) -> None:
+    def setup(
+        self,
+        username: str,
+        password: str,
+        deadline: Optional[Deadline] = None
+    ) -> None:
         """Sets up api session data using username and password.
 
         Parameters
@@ -202,17 +391,27 @@ class SkywardAPI():
             Skyward username.
         password : str
             Skyward password.
+        deadline : Optional[Deadline]
+            Budget for logging in and getting session data (the default is None).
         """
-        data = self.login(username, password)
-        self.login_data = data
-        self.session_params = self.get_session_params()
+        if deadline is None:
+            deadline = Deadline()
+        with self._lock:
+            data = self.login(username, password, deadline=deadline)
+            self.login_data = data
+            self.session_params = self.get_session_params(deadline=deadline)
 
     @staticmethod
     def from_username_password(
         username: str,
         password: str,
         service: str,
-        timeout: int = 60
+        timeout: int = 60,
+        deadline: Optional[Deadline] = None,
+        thread_safe: bool = False,
+        monitor: Optional[ResourceMonitor] = None,
+        transport: Union[str, Transport] = "session",
+        profiler: Optional[SamplingProfiler] = None
     ) -> "SkywardAPI":
         """Returns a logged-in SkywardAPI object using username and password provided.
 
@@ -226,6 +425,16 @@ class SkywardAPI():
             Skyward service.
         timeout : int
             Timeout of requests made to Skyward (the default is 60).
+        deadline : Optional[Deadline]
+            Budget for the whole login (the default is None).
+        thread_safe : bool
+            Whether the api may be shared between threads (the default is False).
+        monitor : Optional[ResourceMonitor]
+            Resource monitor for the api's calls (the default is None).
+        transport : Union[str, Transport]
+            How requests are sent (the default is "session").
+        profiler : Optional[SamplingProfiler]
+            Sampling profiler for the api's calls (the default is None).
 
         Returns
         -------
@@ -238,17 +447,31 @@ class SkywardAPI():
             Incorrect username and password (from setup).
         SkywardError
             Unable to connect to Skyward (from setup).
+        DeadlineExceeded
+            deadline ran out (from setup).
 
         """
-        api = SkywardAPI(service, timeout=timeout)
-        api.setup(username, password)
+        api = SkywardAPI(
+            service,
+            timeout=timeout,
+            thread_safe=thread_safe,
+            monitor=monitor,
+            transport=transport,
+            profiler=profiler
+        )
+        api.setup(username, password, deadline=deadline)
         return api
 
     @staticmethod
     def from_session_data(
         service: str,
         sky_data: Dict[str, str],
-        timeout: int = 60
+        timeout: int = 60,
+        deadline: Optional[Deadline] = None,
+        thread_safe: bool = False,
+        monitor: Optional[ResourceMonitor] = None,
+        transport: Union[str, Transport] = "session",
+        profiler: Optional[SamplingProfiler] = None
     ) -> "SkywardAPI":
         """Generates an API given a service and session data.
 
@@ -258,6 +481,18 @@ class SkywardAPI():
             Skyward service to be used.
         sky_data : Dict[str, str]
             Session data from skyward.
+        timeout : int
+            Timeout of requests made to Skyward (the default is 60).
+        deadline : Optional[Deadline]
+            Budget for restoring the session (the default is None).
+        thread_safe : bool
+            Whether the api may be shared between threads (the default is False).
+        monitor : Optional[ResourceMonitor]
+            Resource monitor for the api's calls (the default is None).
+        transport : Union[str, Transport]
+            How requests are sent (the default is "session").
+        profiler : Optional[SamplingProfiler]
+            Sampling profiler for the api's calls (the default is None).
 
         Returns
         -------
@@ -268,79 +503,147 @@ class SkywardAPI():
         -------
         SessionError
             If session credentials are revoked by Skyward, error is raised.
+        DeadlineExceeded
+            deadline ran out, or left too little time for the page to render.
 
         Side Effects
         ------------
         Closes and regenerates self.session.
 
         """
-        api = SkywardAPI(service, timeout=timeout)
-        api.session_params = sky_data
-        grade_url = api.base_url + "/sfhome01.w"
-        sessionp = api.session_params
-        req3 = api.timed_request(grade_url, data={
-            "encses": sessionp["encses"],
-            "sessionid": sessionp["sessid"]
-        })
-        new_html = api.edit_srcs(req3)
-        try:
-            other_data = new_html.render(script="""
-                () => {
-                    return {
-                        dwd: sff.getValue('dwd'),
-                        nameid: sff.getValue('nameid'),
-                        wfaacl: sff.getValue('wfaacl'),
-                    }
-                }
-            """, retries=2, timeout=2.5, keep_page=False)
-            api.session.close()
-            api.session = HTMLSession()
-        except MaxRetries:
-            raise SessionError("Session destroyed by Skyward.")
-        api.session_params.update(other_data)
+        if deadline is None:
+            deadline = Deadline()
+        api = SkywardAPI(
+            service,
+            timeout=timeout,
+            thread_safe=thread_safe,
+            monitor=monitor,
+            transport=transport,
+            profiler=profiler
+        )
+        with api.track("from_session_data"), api.profile("from_session_data"):
+            api.session_params = sky_data
+            grade_url = api.base_url + "/sfhome01.w"
+            sessionp = api.session_params
+            with deadline.stage("session_setup"):
+                req3 = api.timed_request(grade_url, data={
+                    "encses": sessionp["encses"],
+                    "sessionid": sessionp["sessid"]
+                }, deadline=deadline)
+                new_html = api.edit_srcs(req3)
+                with deadline.stage("render"):
+                    # requests_html stops at the first attempt that works, so
+                    # each attempt may use the whole remaining budget.
+                    render_timeout = deadline.timeout(2.5)
+                    try:
+                        other_data = new_html.render(script="""
+                            () => {
+                                return {
+                                    dwd: sff.getValue('dwd'),
+                                    nameid: sff.getValue('nameid'),
+                                    wfaacl: sff.getValue('wfaacl'),
+                                }
+                            }
+                        """, retries=2, timeout=render_timeout, keep_page=False)
+                        api.session.close()
+                        api.session = api.new_session()
+                    except MaxRetries:
+                        deadline.check_cut_short(render_timeout, 2.5)
+                        raise SessionError("Session destroyed by Skyward.")
+            api.session_params.update(other_data)
 
         return api
 
-    def get_session_params(self) -> Dict[str, str]:
+    def get_session_params(self, deadline: Optional[Deadline] = None) -> Dict[str, str]:
         """Gets session data from Skyward for login.
 
+        Parameters
+        ----------
+        deadline : Optional[Deadline]
+            Budget for getting session data (the default is None).
+
         Returns
         -------
         Dict[str, str]
             Session variables.
 
+        Raises
+        -------
+        SkywardError
+            Skyward returned no session data after several tries.
+        DeadlineExceeded
+            deadline ran out.
+
         """
+        if deadline is None:
+            deadline = Deadline()
         ldata = self.login_data
 
-        req = self.timed_request(ldata["new_url"], data=ldata["params"])
-        page = req.html
-        obj = {}
-        try:
-            obj["sessid"] = page.find("#sessionid", first=True).attrs["value"]
-
-            obj["encses"] = page.find("#encses", first=True).attrs["value"]
-        except AttributeError:
-            obj = self.get_session_params()
-            #Again, sometimes this doesn't work on the first try.
+        obj = {} # type: Dict[str, str]
+        with deadline.stage("session_params"):
+            times = 0
+            while "encses" not in obj:
+                if times > 5:
+                    raise SkywardError("Skyward returning no session data.")
+                req = self.timed_request(
+                    ldata["new_url"],
+                    data=ldata["params"],
+                    deadline=deadline
+                )
+                page = req.html
+                times += 1
+                try:
+                    obj["sessid"] = page.find("#sessionid", first=True).attrs["value"]
+
+                    obj["encses"] = page.find("#encses", first=True).attrs["value"]
+                except AttributeError:
+                    deadline.check()
+                    #Again, sometimes this doesn't work on the first try.
         obj["dwd"] = ldata["params"]["dwd"]
         obj["nameid"] = ldata["params"]["nameid"]
         obj["wfaacl"] = ldata["params"]["wfaacl"]
         return obj
 
+    def grade_buttons(self, page_source: str) -> GradeButtonIndex:
+        """Indexes the grade buttons of a gradebook page.
+
+        The last index is kept and reused while the page source is unchanged,
+        so polls that see the same gradebook page skip the scan.
+
+        Parameters
+        ----------
+        page_source : str
+            Source of the sfgradebook001.w page.
+
+        Returns
+        -------
+        GradeButtonIndex
+            Grade buttons keyed by bucket.
+
+        """
+        key = (len(page_source), hash(page_source))
+        cached = self._grade_buttons
+        if cached is not None and cached[:2] == key:
+            return cached[2]
+        buttons = GradeButtonIndex.from_html(page_source)
+        self._grade_buttons = (key[0], key[1], buttons)
+        return buttons
+
     def get_class_grades(
         self,
-        sm_grade: Element,
+        sm_grade: Union[Element, GradeButton],
         grid_count: int,
         constant_options: Dict[str, str],
         url: str,
-        sm_num: int
+        sm_num: int,
+        deadline: Optional[Deadline] = None
     ) -> SkywardClass:
         """Gets class grades given elements and request options.
 
         Parameters
         ----------
-        sm_grade : Element
-            HTML element containing request information.
+        sm_grade : Union[Element, GradeButton]
+            Grade button containing request information.
         grid_count : int
             Grid count parameter on page.
         constant_options : Dict[str, str]
@@ -349,12 +652,19 @@ class SkywardAPI():
             Request url.
         sm_num : int
             Semester number in question.
+        deadline : Optional[Deadline]
+            Budget for the request (the default is None).
 
         Returns
         -------
         SkywardClass
             Grades from a class.
 
+        Raises
+        -------
+        DeadlineExceeded
+            deadline ran out.
+
         """
         attrs = sm_grade.attrs
         specific_request_data = {
@@ -364,7 +674,7 @@ class SkywardAPI():
             "section": attrs["data-sec"],
             "entityId": attrs["data-eid"]
         }
-        grade_request_data = constant_options
+        grade_request_data = dict(constant_options)
         grade_request_data.update(specific_request_data)
 
         grade_req = self.timed_request(
@@ -372,7 +682,8 @@ class SkywardAPI():
             data=grade_request_data,
             params={
                 "file": "sfgradebook001.w"
-            }
+            },
+            deadline=deadline
         )
         text = grade_req.text
 
@@ -493,7 +804,13 @@ class SkywardAPI():
         sky_class.sort_grades_by_date()
         return sky_class
 
-    def get_semester_grades(self, semester_num: int, page: HTML) -> List[SkywardClass]:
+    def get_semester_grades(
+        self,
+        semester_num: int,
+        page: HTML,
+        deadline: Optional[Deadline] = None,
+        buttons: Optional[GradeButtonIndex] = None
+    ) -> List[SkywardClass]:
         """Gets grades for a specific semester.
 
         Parameters
@@ -502,23 +819,29 @@ class SkywardAPI():
             1 or 2 for first or second semester.
         page : HTML
             HTML Grade page to get buttons/links/etc.
+        deadline : Optional[Deadline]
+            Budget for the class requests (the default is None).
+        buttons : Optional[GradeButtonIndex]
+            Grade buttons of page, if already indexed (the default is None).
 
         Returns
         -------
         List[SkywardClass]
             List of class grades.
 
+        Raises
+        -------
+        DeadlineExceeded
+            deadline ran out.
+
         """
         grades = [] # type: List[SkywardClass]
 
         sessionp = self.session_params
-        grade_buttons = page.find("#showGradeInfo")
+        if buttons is None:
+            buttons = self.grade_buttons(page.html)
 
-        sm_grade_buttons = [
-            button
-            for button in grade_buttons
-            if button.attrs["data-lit"] == "SM{0}".format(semester_num)
-        ]
+        sm_grade_buttons = buttons.bucket("SM{0}".format(semester_num))
         grade_req_url = "{0}/httploader.p".format(self.base_url)
 
         constant_options = {
@@ -531,22 +854,34 @@ class SkywardAPI():
         }
         grid_count = 1
 
-
-        for class_sm_grade in sm_grade_buttons:
-            grades.append(
-                self.get_class_grades(
-                    class_sm_grade,
-                    grid_count,
-                    constant_options,
-                    grade_req_url,
-                    semester_num
-                )
+        def class_grades(class_sm_grade: GradeButton) -> SkywardClass:
+            return self.get_class_grades(
+                class_sm_grade,
+                grid_count,
+                constant_options,
+                grade_req_url,
+                semester_num,
+                deadline=deadline
             )
+
+        workers = min(self.transport.max_concurrency, len(sm_grade_buttons))
+        if workers > 1:
+            if self.profiler is not None:
+                class_grades = self.profiler.bind(class_grades)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                grades.extend(pool.map(class_grades, sm_grade_buttons))
+        else:
+            grades.extend(map(class_grades, sm_grade_buttons))
         return grades
 
-    def get_grades(self) -> List[SkywardClass]:
+    def get_grades(self, deadline: Optional[Deadline] = None) -> List[SkywardClass]:
         """Gets grades from both semesters.
 
+        Parameters
+        ----------
+        deadline : Optional[Deadline]
+            Budget for getting grades (the default is None).
+
         Returns
         -------
         List[SkywardClass]
@@ -556,52 +891,114 @@ class SkywardAPI():
         ------
         SessionError
             If the session is destroyed, no data can be received.
+        DeadlineExceeded
+            deadline ran out, or left too little time for the page to render.
 
         """
+        if deadline is None:
+            deadline = Deadline()
+        with self.track("get_grades"), self.profile("get_grades"), \
+                deadline.stage("get_grades"):
+            return self._get_grades(deadline)
+
+    def _get_grades(self, deadline: Deadline) -> List[SkywardClass]:
         grade_url = self.base_url + "/sfgradebook001.w"
         sessionp = self.session_params
-        req1 = self.timed_request(grade_url, data={
-            "encses": sessionp["encses"],
-            "sessionid": sessionp["sessid"]
-        })
-        new_html = self.edit_srcs(req1)
+        with deadline.stage("gradebook_page"):
+            req1 = self.timed_request(grade_url, data={
+                "encses": sessionp["encses"],
+                "sessionid": sessionp["sessid"]
+            }, deadline=deadline)
+            new_html = self.edit_srcs(req1)
         if "Your session has timed out" in new_html.text or "session has expired" in new_html.text:
             raise SessionError("Session destroyed. Session timed out.")
-        ret_data = new_html.render()
-
-        grades = self.get_semester_grades(1, new_html)
-        grades += self.get_semester_grades(2, new_html)
+        with deadline.stage("render"):
+            render_timeout = deadline.timeout(8.0)
+            try:
+                ret_data = new_html.render(retries=8, timeout=render_timeout)
+            except MaxRetries:
+                deadline.check_cut_short(render_timeout, 8.0)
+                raise
+
+        buttons = self.grade_buttons(new_html.html)
+        with deadline.stage("class_grades"):
+            grades = self.get_semester_grades(
+                1,
+                new_html,
+                deadline=deadline,
+                buttons=buttons
+            )
+            grades += self.get_semester_grades(
+                2,
+                new_html,
+                deadline=deadline,
+                buttons=buttons
+            )
         if grades == {}:
             raise SessionError("Session destroyed. No grades returned.")
         self.session.close()
-        self.session = HTMLSession()
+        self.session = self.new_session()
         return grades
 
-    def get_grades_text(self) -> Dict[str, List[str]]:
+    def get_gradebook(self, deadline: Optional[Deadline] = None) -> Gradebook:
+        """Gets grades from both semesters as a Gradebook.
+
+        Parameters
+        ----------
+        deadline : Optional[Deadline]
+            Budget for getting grades (the default is None).
+
+        Returns
+        -------
+        Gradebook
+            Grades from both semesters, indexed by period, title and teacher.
+
+        Raises
+        ------
+        SessionError
+            If the session is destroyed, no data can be received.
+
+        """
+        return Gradebook(self.get_grades(deadline=deadline))
+
+    def get_grades_text(self, deadline: Optional[Deadline] = None) -> Dict[str, List[str]]:
         """Converts Assignments in get_grades() to strings
 
+        Parameters
+        ----------
+        deadline : Optional[Deadline]
+            Budget for getting grades (the default is None).
+
         Returns
         -------
         Dict[str, List[str]]
             Grades (as a string) from both semesters.
 
         """
-        grades = self.get_grades()
+        grades = self.get_grades(deadline=deadline)
         str_grades = {}
         for sky_class in grades:
             str_grades[sky_class.skyward_title()] = sky_class.grades_to_text()
         return str_grades
 
-    def get_grades_json(self) -> Dict[str, List[Dict[str, Any]]]:
+    def get_grades_json(
+        self,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """Converts Assignments in get_grades() to strings
 
+        Parameters
+        ----------
+        deadline : Optional[Deadline]
+            Budget for getting grades (the default is None).
+
         Returns
         -------
         Dict[str, List[str]]
             Grades (as a string) from both semesters.
 
         """
-        grades = self.get_grades()
+        grades = self.get_grades(deadline=deadline)
         json_grades = {}
         for sky_class in grades:
             class_grades = sky_class.grades
@@ -615,9 +1012,14 @@ class SkywardAPI():
 
         return json_grades
 
-    def keep_alive(self) -> None:
+    def keep_alive(self, deadline: Optional[Deadline] = None) -> None:
         """Issues a keep-alive request for the session.
 
+        Parameters
+        ----------
+        deadline : Optional[Deadline]
+            Budget for the request (the default is None).
+
         """
         grade_url = self.base_url + "/qsuprhttp000.w?"
         sessionp = self.session_params
@@ -628,4 +1030,4 @@ class SkywardAPI():
             "nameid": sessionp["nameid"],
             "requestAction": "mySession",
             "wfaacl": sessionp["wfaacl"]
-        }, method = "get")
+        }, method = "get", deadline=deadline)
@@ -1,3 +1,11 @@
-from skyward_api.api import SkywardAPI, SkywardError, SessionError
+from skyward_api.API import SkywardAPI
+from skyward_api.errors import SkywardError, SessionError, DeadlineExceeded
+from skyward_api.deadline import Deadline
 from skyward_api.assignment import Assignment
 from skyward_api.skyward_class import SkywardClass
+from skyward_api.gradebook import Gradebook
+from skyward_api.resources import ResourceMonitor
+from skyward_api.transport import Transport, SessionTransport, HTTP2Transport
+from skyward_api.scheduler import PollScheduler, GradeChange
+from skyward_api.sharding import HashRing, LeaseBackend, SQLiteLeaseBackend, ShardCoordinator
+from skyward_api.profiling import SamplingProfiler
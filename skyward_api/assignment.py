@@ -1,5 +1,6 @@
 import datetime
 from typing import Any
+from skyward_api.intern import intern
 
 class Assignment():
     def __init__(
@@ -10,16 +11,16 @@ class Assignment():
         letter_grade: str,
         date: str
     ) -> None:
-        self.name = name
-        self.num_points = num_points
-        self.total_points = total_points
-        self.letter_grade = letter_grade
+        self.name = intern(name)
+        self.num_points = intern(num_points)
+        self.total_points = intern(total_points)
+        self.letter_grade = intern(letter_grade)
 
         spl = date.split("/")
         if len(spl[2]) != 4:
             year = "20" + spl[2]
             spl[2] = year
-        self.date = "/".join(spl)
+        self.date = intern("/".join(spl))
 
     def points_str(self) -> str:
         return "{0}/{1} ({2})".format(
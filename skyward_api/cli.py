@@ -0,0 +1,477 @@
+"""Bulk grade export for many accounts.
+
+Reads accounts from a file with one JSON object per line, either::
+
+    {"service": "...", "username": "...", "password": "..."}
+    {"service": "...", "session": {...session_params...}}
+
+(an optional "id" names the account in the output; accounts with neither an
+id nor a username are named after their line, e.g. "line-3"), fetches every
+account in parallel and writes one NDJSON record per student, or per class
+with ``--per-class``, as soon as it completes. With ``--profile-rate`` a fraction
+of api calls is sampled and the collapsed stacks of every worker are merged
+into one flamegraph-ready profile.
+"""
+import argparse
+import concurrent.futures
+import json
+import sys
+import time
+from typing import Any, Dict, IO, Iterator, List, Optional, Set
+from skyward_api.API import SkywardAPI
+from skyward_api.deadline import Deadline
+from skyward_api.profiling import SamplingProfiler
+
+def read_accounts(stream: IO[str]) -> Iterator[Dict[str, Any]]:
+    """Reads account records from a stream.
+
+    Parameters
+    ----------
+    stream : IO[str]
+        Text stream with one JSON object per line. Blank lines and lines
+        starting with # are skipped.
+
+    Returns
+    -------
+    Iterator[Dict[str, Any]]
+        Account records. Records with neither "id" nor "username" get an
+        "id" of "line-<line number>" so their output can be told apart.
+
+    Raises
+    -------
+    ValueError
+        A line is not a valid account record.
+
+    """
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            account = json.loads(line)
+        except ValueError:
+            raise ValueError("Line {0} is not valid JSON.".format(number))
+        if not isinstance(account, dict) or "service" not in account:
+            raise ValueError("Line {0} has no service.".format(number))
+        if "session" not in account and not (
+            "username" in account and "password" in account
+        ):
+            raise ValueError(
+                "Line {0} needs a session or a username and password.".format(number)
+            )
+        if "id" not in account and "username" not in account:
+            account["id"] = "line-{0}".format(number)
+        yield account
+
+def account_id(account: Dict[str, Any]) -> str:
+    """Returns the name an account is reported under.
+
+    Parameters
+    ----------
+    account : Dict[str, Any]
+        Account record.
+
+    Returns
+    -------
+    str
+        account["id"], falling back to the username.
+
+    """
+    return str(account.get("id", account.get("username", "")))
+
+def fetch_account(
+    account: Dict[str, Any],
+    timeout: int = 60,
+    budget: Optional[float] = None,
+    thread_safe: bool = False,
+    profile_rate: float = 0.0,
+    profile_interval: float = 0.005
+) -> Dict[str, Any]:
+    """Fetches grades for one account. Runs in a worker process or thread.
+
+    Parameters
+    ----------
+    account : Dict[str, Any]
+        Account record.
+    timeout : int
+        Timeout of requests made to Skyward (the default is 60).
+    budget : Optional[float]
+        Seconds the whole account may take (the default is None).
+    thread_safe : bool
+        Whether to build the api in thread-safe mode, needed when running
+        outside the main thread (the default is False).
+    profile_rate : float
+        Fraction of api calls to profile (the default is 0).
+    profile_interval : float
+        Seconds between samples of a profiled call (the default is 0.005).
+
+    Returns
+    -------
+    Dict[str, Any]
+        Result record with "id", "ok", "seconds" and either "grades" (Skyward
+        title to list of assignment dicts) or "error". When profiling, also
+        "profile" (SamplingProfiler.to_dict()), which export removes before
+        writing the record.
+
+    """
+    start = time.monotonic()
+    deadline = Deadline(budget)
+    profiler = None # type: Optional[SamplingProfiler]
+    if profile_rate > 0:
+        profiler = SamplingProfiler(profile_rate, profile_interval)
+    record = {"id": account_id(account)} # type: Dict[str, Any]
+    try:
+        if "session" in account:
+            api = SkywardAPI.from_session_data(
+                account["service"],
+                account["session"],
+                timeout=timeout,
+                deadline=deadline,
+                thread_safe=thread_safe,
+                profiler=profiler
+            )
+        else:
+            api = SkywardAPI.from_username_password(
+                account["username"],
+                account["password"],
+                account["service"],
+                timeout=timeout,
+                deadline=deadline,
+                thread_safe=thread_safe,
+                profiler=profiler
+            )
+        record["grades"] = api.get_grades_json(deadline=deadline)
+        record["ok"] = True
+    except Exception as e:
+        record["ok"] = False
+        record["error"] = "{0}: {1}".format(type(e).__name__, e)
+    record["seconds"] = round(time.monotonic() - start, 3)
+    record["stages"] = {
+        stage: round(seconds, 3)
+        for stage, seconds in deadline.stages.items()
+    }
+    if profiler is not None:
+        record["profile"] = profiler.to_dict()
+    return record
+
+def records_for_output(result: Dict[str, Any], per_class: bool) -> List[Dict[str, Any]]:
+    """Splits a result into the records written for it.
+
+    Parameters
+    ----------
+    result : Dict[str, Any]
+        Result of fetch_account.
+    per_class : bool
+        Whether to write one record per class instead of per student.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        Records to write.
+
+    """
+    if not per_class or not result["ok"]:
+        return [result]
+    return [
+        {"id": result["id"], "ok": True, "class": title, "grades": grades}
+        for title, grades in result["grades"].items()
+    ]
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Returns a percentile of values by nearest rank.
+
+    Parameters
+    ----------
+    values : List[float]
+        Sorted values.
+    fraction : float
+        Percentile as a fraction (e.g. 0.95).
+
+    Returns
+    -------
+    float
+        The percentile, or 0 if values is empty.
+
+    """
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))
+    return values[index]
+
+def summarize(results: List[Dict[str, Any]], wall_seconds: float) -> str:
+    """Describes throughput and latency of an export.
+
+    Parameters
+    ----------
+    results : List[Dict[str, Any]]
+        Outcomes returned by export, each with "ok" and "seconds".
+    wall_seconds : float
+        Seconds the whole export took.
+
+    Returns
+    -------
+    str
+        One-line summary.
+
+    """
+    latencies = sorted(result["seconds"] for result in results)
+    failed = sum(1 for result in results if not result["ok"])
+    rate = len(results) / wall_seconds if wall_seconds > 0 else 0.0
+    return (
+        "{0} accounts ({1} failed) in {2:.1f}s, {3:.2f} accounts/s, "
+        "latency p50 {4:.2f}s p95 {5:.2f}s max {6:.2f}s"
+    ).format(
+        len(results),
+        failed,
+        wall_seconds,
+        rate,
+        percentile(latencies, 0.5),
+        percentile(latencies, 0.95),
+        latencies[-1] if latencies else 0.0
+    )
+
+def export(
+    accounts: List[Dict[str, Any]],
+    output: IO[str],
+    concurrency: int = 8,
+    rate: Optional[float] = None,
+    per_class: bool = False,
+    timeout: int = 60,
+    budget: Optional[float] = None,
+    threads: bool = False,
+    profiler: Optional[SamplingProfiler] = None
+) -> List[Dict[str, Any]]:
+    """Fetches accounts in parallel and streams NDJSON records as they finish.
+
+    Parameters
+    ----------
+    accounts : List[Dict[str, Any]]
+        Account records.
+    output : IO[str]
+        Stream NDJSON records are written to.
+    concurrency : int
+        Number of accounts fetched at once (the default is 8).
+    rate : Optional[float]
+        Most accounts started per second. If not given, accounts start as soon
+        as a worker is free (the default is None).
+    per_class : bool
+        Whether to write one record per class instead of per student
+        (the default is False).
+    timeout : int
+        Timeout of requests made to Skyward (the default is 60).
+    budget : Optional[float]
+        Seconds each account may take (the default is None).
+    threads : bool
+        Whether to fetch in a thread pool with thread-safe apis instead of a
+        process pool (the default is False).
+    profiler : Optional[SamplingProfiler]
+        Profiler whose rate and interval the workers sample with, and which
+        their samples are merged into (the default is None).
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        "ok" and "seconds" of every account, in completion order. Grades are
+        only written to output, never kept, so memory does not grow with the
+        number of accounts' grades.
+
+    """
+    results = [] # type: List[Dict[str, Any]]
+    profile_rate = profiler.rate if profiler is not None else 0.0
+    profile_interval = profiler.interval if profiler is not None else 0.005
+    pending = set() # type: Set[concurrent.futures.Future]
+    next_start = time.monotonic()
+
+    def drain(block: bool) -> None:
+        nonlocal pending
+        if not pending:
+            return
+        done, pending = concurrent.futures.wait(
+            pending,
+            timeout=None if block else 0,
+            return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for future in done:
+            result = future.result()
+            profile = result.pop("profile", None)
+            if profile is not None and profiler is not None:
+                profiler.merge(profile)
+            results.append({"ok": result["ok"], "seconds": result["seconds"]})
+            for record in records_for_output(result, per_class):
+                output.write(json.dumps(record) + "\n")
+            output.flush()
+
+    if threads:
+        pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=concurrency
+        ) # type: concurrent.futures.Executor
+    else:
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=concurrency)
+    with pool:
+        for account in accounts:
+            while len(pending) >= concurrency:
+                drain(True)
+            if rate:
+                wait = next_start - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                next_start = max(next_start, time.monotonic()) + 1 / rate
+            pending.add(
+                pool.submit(
+                    fetch_account,
+                    account,
+                    timeout,
+                    budget,
+                    threads,
+                    profile_rate,
+                    profile_interval
+                )
+            )
+            drain(False)
+        while pending:
+            drain(True)
+    return results
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="skyward-export",
+        description="Export grades for many Skyward accounts as NDJSON."
+    )
+    parser.add_argument(
+        "accounts",
+        help="File with one JSON account per line, or - for stdin."
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="-",
+        help="File to write NDJSON to (default: stdout)."
+    )
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=8,
+        help="Accounts fetched at once (default: 8)."
+    )
+    parser.add_argument(
+        "-r", "--rate",
+        type=float,
+        default=None,
+        help="Most accounts started per second (default: unlimited)."
+    )
+    parser.add_argument(
+        "--threads",
+        action="store_true",
+        help="Fetch in threads instead of worker processes."
+    )
+    parser.add_argument(
+        "--per-class",
+        action="store_true",
+        help="Write one record per class instead of per student."
+    )
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=60,
+        help="Seconds to keep retrying a failed connection (default: 60)."
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Seconds each account may take in total (default: unlimited)."
+    )
+    parser.add_argument(
+        "--profile-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of api calls to profile, from 0 to 1 (default: 0)."
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=0.005,
+        help="Seconds between stack samples of a profiled call (default: 0.005)."
+    )
+    parser.add_argument(
+        "--profile-output",
+        default=None,
+        help="File to write collapsed stacks to, for flamegraph.pl or speedscope."
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=15,
+        help="Hot functions listed in the profile summary (default: 15)."
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1.")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive.")
+    if not 0 <= args.profile_rate <= 1:
+        parser.error("--profile-rate must be between 0 and 1.")
+    if args.profile_interval <= 0:
+        parser.error("--profile-interval must be positive.")
+    return args
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the skyward-export command.
+
+    Parameters
+    ----------
+    argv : Optional[List[str]]
+        Command line arguments (the default is None, meaning sys.argv).
+
+    Returns
+    -------
+    int
+        Exit status: 0 if every account succeeded, 1 otherwise.
+
+    """
+    args = parse_args(argv)
+    if args.accounts == "-":
+        accounts = list(read_accounts(sys.stdin))
+    else:
+        with open(args.accounts, "r") as stream:
+            accounts = list(read_accounts(stream))
+
+    profiler = None # type: Optional[SamplingProfiler]
+    if args.profile_rate > 0:
+        profiler = SamplingProfiler(args.profile_rate, args.profile_interval)
+
+    start = time.monotonic()
+    if args.output == "-":
+        results = export(
+            accounts,
+            sys.stdout,
+            args.concurrency,
+            args.rate,
+            args.per_class,
+            args.timeout,
+            args.deadline,
+            args.threads,
+            profiler
+        )
+    else:
+        with open(args.output, "w") as output:
+            results = export(
+                accounts,
+                output,
+                args.concurrency,
+                args.rate,
+                args.per_class,
+                args.timeout,
+                args.deadline,
+                args.threads,
+                profiler
+            )
+    print(summarize(results, time.monotonic() - start), file=sys.stderr)
+    if profiler is not None:
+        print(profiler.summary(args.profile_top), file=sys.stderr)
+        if args.profile_output is not None:
+            with open(args.profile_output, "w") as stacks:
+                profiler.write_collapsed(stacks)
+    return 0 if all(result["ok"] for result in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
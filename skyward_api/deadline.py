@@ -0,0 +1,228 @@
+import contextlib
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from skyward_api.errors import DeadlineExceeded
+
+# Shortest timeout handed to a blocking step. Anything shorter is treated as
+# an expired budget: requests rejects a timeout of 0 and pyppeteer treats
+# 0 ms as no timeout at all.
+MIN_TIMEOUT = 0.001
+
+class Deadline():
+    """Time budget shared by every request and parse step of a call.
+
+    Parameters
+    ----------
+    budget : Optional[float]
+        Seconds the call may take. If not given, the deadline never expires
+        but stage timings are still recorded (the default is None).
+    clock : Callable[[], float]
+        Source of the current time (the default is time.monotonic).
+
+    Attributes
+    ----------
+    budget : Optional[float]
+        Seconds the call may take.
+    stages : Dict[str, float]
+        Seconds spent in each stage, keyed by "/"-joined stage path
+        (e.g. "get_grades/render").
+
+    """
+    def __init__(
+        self,
+        budget: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.budget = budget
+        self.clock = clock
+        self.start = clock()
+        self.stages = {} # type: Dict[str, float]
+        self._open = [] # type: List[Tuple[str, float]]
+
+    def elapsed(self) -> float:
+        """Returns seconds spent since the deadline started.
+
+        Returns
+        -------
+        float
+            Seconds since the deadline started.
+
+        """
+        return self.clock() - self.start
+
+    def remaining(self) -> Optional[float]:
+        """Returns seconds left in the budget.
+
+        Returns
+        -------
+        Optional[float]
+            Seconds left (never negative), or None if there is no budget.
+
+        """
+        if self.budget is None:
+            return None
+        return max(0.0, self.budget - self.elapsed())
+
+    def expired(self) -> bool:
+        """Returns whether the budget is used up.
+
+        Returns
+        -------
+        bool
+            Whether no time is left.
+
+        """
+        return self.budget is not None and self.remaining() == 0
+
+    def current_stage(self) -> str:
+        """Returns the stage currently running.
+
+        Returns
+        -------
+        str
+            "/"-joined stage path, or "" outside of any stage.
+
+        """
+        if not self._open:
+            return ""
+        return self._open[-1][0]
+
+    def check(self) -> None:
+        """Raises if the budget is used up.
+
+        Raises
+        -------
+        DeadlineExceeded
+            No time is left.
+
+        """
+        if self.expired():
+            raise self._exceeded()
+
+    def _exceeded(self) -> DeadlineExceeded:
+        now = self.clock()
+        stages = dict(self.stages)
+        for path, entered in self._open:
+            stages[path] = stages.get(path, 0.0) + now - entered
+        return DeadlineExceeded(
+            self.current_stage() or "call",
+            now - self.start,
+            stages
+        )
+
+    def timeout(self, cap: float, attempts: int = 1) -> float:
+        """Returns a per-attempt timeout for a blocking step.
+
+        Parameters
+        ----------
+        cap : float
+            Longest an attempt should wait regardless of the budget.
+        attempts : int
+            Number of attempts the step may make with this timeout
+            (the default is 1).
+
+        Returns
+        -------
+        float
+            cap, or the time left split between the attempts if that is shorter.
+
+        Raises
+        -------
+        DeadlineExceeded
+            Less than MIN_TIMEOUT would be left for an attempt.
+
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return cap
+        timeout = min(cap, remaining / attempts)
+        if timeout < MIN_TIMEOUT:
+            raise self._exceeded()
+        return timeout
+
+    def check_cut_short(self, timeout: float, cap: float) -> None:
+        """Raises if a step that timed out was given less than its cap.
+
+        Call after every attempt of a step failed, with the timeout the
+        attempts were given. A step that fails only because the budget cut its
+        timeout short is reported as DeadlineExceeded rather than as whatever
+        a full-length failure would mean.
+
+        Parameters
+        ----------
+        timeout : float
+            Timeout each attempt was given.
+        cap : float
+            Timeout the step asked for.
+
+        Raises
+        -------
+        DeadlineExceeded
+            No time is left, or timeout was shorter than cap.
+
+        """
+        self.check()
+        if timeout < cap:
+            raise self._exceeded()
+
+    def request_timeout(self) -> Optional[float]:
+        """Returns the timeout for a single request.
+
+        Returns
+        -------
+        Optional[float]
+            Seconds left, or None if there is no budget.
+
+        Raises
+        -------
+        DeadlineExceeded
+            Less than MIN_TIMEOUT is left.
+
+        """
+        remaining = self.remaining()
+        if remaining is not None and remaining < MIN_TIMEOUT:
+            raise self._exceeded()
+        return remaining
+
+    def sleep(self, seconds: float) -> None:
+        """Sleeps without overrunning the budget.
+
+        Parameters
+        ----------
+        seconds : float
+            Seconds to sleep if the budget allows.
+
+        Raises
+        -------
+        DeadlineExceeded
+            No time is left after sleeping.
+
+        """
+        time.sleep(self.timeout(seconds))
+        self.check()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Attributes time spent in the block to a stage.
+
+        Parameters
+        ----------
+        name : str
+            Stage name. Nested stages are recorded under "outer/inner".
+
+        Raises
+        -------
+        DeadlineExceeded
+            No time is left on entering the stage.
+
+        """
+        outer = self.current_stage()
+        path = outer + "/" + name if outer else name
+        entered = self.clock()
+        self._open.append((path, entered))
+        try:
+            self.check()
+            yield
+        finally:
+            self._open.pop()
+            self.stages[path] = self.stages.get(path, 0.0) + self.clock() - entered
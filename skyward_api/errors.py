@@ -0,0 +1,47 @@
+from typing import Dict
+
+class SkywardError(RuntimeError):
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+
+class SessionError(SkywardError):
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+
+class DeadlineExceeded(SkywardError):
+    """Raised when a call runs out of its time budget.
+
+    Parameters
+    ----------
+    stage : str
+        Stage that was running when the budget ran out.
+    elapsed : float
+        Seconds spent since the deadline started.
+    stages : Dict[str, float]
+        Seconds spent in each stage so far.
+
+    Attributes
+    ----------
+    stage : str
+        Stage that was running when the budget ran out.
+    elapsed : float
+        Seconds spent since the deadline started.
+    stages : Dict[str, float]
+        Seconds spent in each stage so far.
+
+    """
+    def __init__(self, stage: str, elapsed: float, stages: Dict[str, float]) -> None:
+        spent = ", ".join(
+            "{0} {1:.2f}s".format(name, seconds)
+            for name, seconds in stages.items()
+        )
+        super().__init__(
+            "Deadline exceeded during {0} after {1:.2f}s ({2}).".format(
+                stage,
+                elapsed,
+                spent
+            )
+        )
+        self.stage = stage
+        self.elapsed = elapsed
+        self.stages = stages
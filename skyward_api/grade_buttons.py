@@ -0,0 +1,156 @@
+import bisect
+import html
+import re
+from typing import Dict, List, Optional, Tuple
+
+BUTTON_ID = "showGradeInfo"
+
+# Attributes get_class_grades sends with each class's grade request.
+REQUIRED_ATTRS = ("data-cni", "data-gid", "data-sid", "data-sec", "data-eid")
+
+# Comments and elements whose content is text, not markup; tags inside them
+# (e.g. button templates in Skyward's inline JS) are not buttons.
+_SKIP = re.compile(
+    r"<!--.*?(?:-->|\Z)|<(script|style|textarea|title)\b[^>]*>.*?(?:</\1\s*>|\Z)",
+    re.IGNORECASE | re.DOTALL
+)
+
+_TAG = re.compile(r"""<[A-Za-z][^\s/>]*(?:[^>"']|"[^"]*"|'[^']*')*>""")
+_ATTR = re.compile(
+    r"""([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>"']+)))?"""
+)
+
+class GradeButton():
+    """A #showGradeInfo button on the gradebook page.
+
+    Parameters
+    ----------
+    attrs : Dict[str, str]
+        Attributes of the button.
+
+    Attributes
+    ----------
+    attrs : Dict[str, str]
+        Attributes of the button, including data-lit (the grade bucket, e.g.
+        "SM1") and data-cni, data-gid, data-sid, data-sec and data-eid used
+        to request the class's grades.
+
+    """
+    def __init__(self, attrs: Dict[str, str]) -> None:
+        self.attrs = attrs
+
+    @property
+    def bucket(self) -> str:
+        return self.attrs.get("data-lit", "")
+
+def parse_attrs(tag: str) -> Dict[str, str]:
+    """Parses the attributes of an opening tag.
+
+    Parameters
+    ----------
+    tag : str
+        Opening tag, e.g. "<a id='x' data-lit=\\"SM1\\">".
+
+    Returns
+    -------
+    Dict[str, str]
+        Lower-cased attribute names to unescaped values ("" if valueless).
+
+    """
+    end = len(tag) - 1
+    start = 1
+    while start < end and not tag[start].isspace():
+        start += 1
+    attrs = {} # type: Dict[str, str]
+    for match in _ATTR.finditer(tag, start, end):
+        name, double, single, bare = match.groups()
+        value = double if double is not None else single if single is not None else bare
+        attrs.setdefault(name.lower(), html.unescape(value or ""))
+    return attrs
+
+class GradeButtonIndex():
+    """Every grade button on a gradebook page, grouped by bucket.
+
+    Built by scanning the page source once for the button id instead of
+    walking the DOM, and reusable for every semester. Matches inside
+    comments, scripts and styles, and tags missing any of REQUIRED_ATTRS,
+    are skipped.
+
+    Parameters
+    ----------
+    buttons : List[GradeButton]
+        Buttons in page order.
+
+    Attributes
+    ----------
+    buttons : List[GradeButton]
+        Buttons in page order.
+    buckets : Dict[str, List[GradeButton]]
+        Buttons keyed by data-lit (e.g. "SM1"), in page order.
+
+    """
+    def __init__(self, buttons: List[GradeButton]) -> None:
+        self.buttons = buttons
+        self.buckets = {} # type: Dict[str, List[GradeButton]]
+        for button in buttons:
+            self.buckets.setdefault(button.bucket, []).append(button)
+
+    @staticmethod
+    def from_html(text: str) -> "GradeButtonIndex":
+        """Indexes the grade buttons in a gradebook page.
+
+        Parameters
+        ----------
+        text : str
+            Source of the sfgradebook001.w page.
+
+        Returns
+        -------
+        GradeButtonIndex
+            Index of the page's grade buttons.
+
+        """
+        buttons = []
+        position = text.find(BUTTON_ID)
+        skipped = None # type: Optional[Tuple[List[int], List[int]]]
+        while position != -1:
+            if skipped is None:
+                spans = [match.span() for match in _SKIP.finditer(text)]
+                skipped = ([start for start, _ in spans], [end for _, end in spans])
+            starts, ends = skipped
+            span = bisect.bisect_right(starts, position) - 1
+            if span >= 0 and position < ends[span]:
+                position = text.find(BUTTON_ID, ends[span])
+                continue
+            start = text.rfind("<", 0, position)
+            match = _TAG.match(text, start) if start != -1 else None
+            if match is not None and match.end() > position:
+                attrs = parse_attrs(match.group())
+                if attrs.get("id") == BUTTON_ID and all(
+                    name in attrs for name in REQUIRED_ATTRS
+                ):
+                    buttons.append(GradeButton(attrs))
+                position = match.end()
+            else:
+                position += len(BUTTON_ID)
+            position = text.find(BUTTON_ID, position)
+        return GradeButtonIndex(buttons)
+
+    def bucket(self, name: str) -> List[GradeButton]:
+        """Returns the buttons of a bucket.
+
+        Parameters
+        ----------
+        name : str
+            data-lit value, e.g. "SM1".
+
+        Returns
+        -------
+        List[GradeButton]
+            Buttons in page order.
+
+        """
+        return list(self.buckets.get(name, []))
+
+    def __len__(self) -> int:
+        return len(self.buttons)
@@ -0,0 +1,110 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+from skyward_api.skyward_class import SkywardClass
+
+class Gradebook():
+    """Collection of SkywardClasses with lookups by period, title and teacher.
+
+    Parameters
+    ----------
+    classes : Optional[Iterable[SkywardClass]]
+        Classes to start with (the default is None).
+
+    Attributes
+    ----------
+    classes : List[SkywardClass]
+        Classes in the order they were added.
+
+    """
+    def __init__(self, classes: Optional[Iterable[SkywardClass]] = None) -> None:
+        self.classes = [] # type: List[SkywardClass]
+        self._by_period = {} # type: Dict[int, List[SkywardClass]]
+        self._by_title = {} # type: Dict[str, List[SkywardClass]]
+        self._by_teacher = {} # type: Dict[str, List[SkywardClass]]
+        for sky_class in classes or []:
+            self.add_class(sky_class)
+
+    def add_class(self, sky_class: SkywardClass) -> None:
+        """Adds a class to the gradebook.
+
+        Parameters
+        ----------
+        sky_class : SkywardClass
+            Class to add.
+
+        Side-Effects
+        ------------
+        Class is added to self.classes and the lookups.
+
+        """
+        self.classes.append(sky_class)
+        self._by_period.setdefault(sky_class.period, []).append(sky_class)
+        self._by_title.setdefault(sky_class.skyward_title(), []).append(sky_class)
+        self._by_teacher.setdefault(sky_class.teacher, []).append(sky_class)
+
+    def by_period(self, period: int) -> List[SkywardClass]:
+        """Returns classes in a period.
+
+        Parameters
+        ----------
+        period : int
+            Period number.
+
+        Returns
+        -------
+        List[SkywardClass]
+            Classes in that period (one per semester).
+
+        """
+        return list(self._by_period.get(period, []))
+
+    def by_title(self, title: str) -> List[SkywardClass]:
+        """Returns classes with a Skyward title.
+
+        Parameters
+        ----------
+        title : str
+            Skyward title ("CLASS NAME (Period #) TEACHER NAME").
+
+        Returns
+        -------
+        List[SkywardClass]
+            Classes with that title (one per semester).
+
+        """
+        return list(self._by_title.get(title, []))
+
+    def by_teacher(self, teacher: str) -> List[SkywardClass]:
+        """Returns classes taught by a teacher.
+
+        Parameters
+        ----------
+        teacher : str
+            Teacher name as Skyward shows it.
+
+        Returns
+        -------
+        List[SkywardClass]
+            Classes taught by that teacher.
+
+        """
+        return list(self._by_teacher.get(teacher, []))
+
+    def titles(self) -> List[str]:
+        """Returns the distinct Skyward titles in the gradebook.
+
+        Returns
+        -------
+        List[str]
+            Titles in the order they were first added.
+
+        """
+        return list(self._by_title)
+
+    def __iter__(self) -> Iterator[SkywardClass]:
+        return iter(self.classes)
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    def __getitem__(self, index: int) -> SkywardClass:
+        return self.classes[index]
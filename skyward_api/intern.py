@@ -0,0 +1,100 @@
+import collections
+import threading
+import typing
+from typing import Any
+
+class InternTable():
+    """Bounded table that shares one copy of equal strings.
+
+    Unlike sys.intern, entries can be evicted and cleared, so the table does not
+    grow forever in long-running pollers. The least recently used entries are
+    dropped once it holds max_size strings.
+
+    Parameters
+    ----------
+    max_size : int
+        Most strings kept (the default is 65536).
+
+    Attributes
+    ----------
+    hits : int
+        Lookups that returned an already interned string.
+    misses : int
+        Lookups that added a new string.
+
+    """
+    def __init__(self, max_size: int = 65536) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._table = collections.OrderedDict() # type: typing.OrderedDict[str, str]
+        self._lock = threading.Lock()
+
+    def intern(self, value: Any) -> Any:
+        """Returns the shared copy of a string.
+
+        Parameters
+        ----------
+        value : Any
+            String to intern. Subclasses of str (such as strings derived from
+            parsed pages) are converted to plain str first. Other values are
+            returned unchanged.
+
+        Returns
+        -------
+        Any
+            Shared string equal to value, or value if it is not a string.
+
+        """
+        if not isinstance(value, str):
+            return value
+        with self._lock:
+            shared = self._table.get(value)
+            if shared is not None:
+                self._table.move_to_end(value)
+                self.hits += 1
+                return shared
+            if type(value) is not str:
+                value = str.__str__(value)
+            self._table[value] = value
+            self.misses += 1
+            if len(self._table) > self.max_size:
+                self._table.popitem(last=False)
+            return value
+
+    def clear(self) -> None:
+        """Drops every interned string and resets the counters."""
+        with self._lock:
+            self._table.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._table
+
+strings = InternTable()
+
+def intern(value: Any) -> Any:
+    """Interns a string in the shared table used when building grades.
+
+    Parameters
+    ----------
+    value : Any
+        String to intern; other values are returned unchanged.
+
+    Returns
+    -------
+    Any
+        Shared string equal to value.
+
+    """
+    return strings.intern(value)
+
+def clear() -> None:
+    """Clears the shared table used when building grades."""
+    strings.clear()
@@ -0,0 +1,340 @@
+import collections
+import contextlib
+import os
+import random
+import sys
+import threading
+from types import FrameType
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Set, Tuple
+
+# Stage of a sample is decided by the innermost frame matching one of these
+# (function name, path fragment) rules. An empty fragment matches any file.
+STAGE_RULES = [
+    ("render", "requests_html", "render"),
+    ("edit_srcs", "", "edit_srcs"),
+    ("find", "requests_html", "dom_find"),
+    ("xpath", "requests_html", "dom_find"),
+    ("sort_grades_by_date", "", "sorting"),
+    ("reindex", "skyward_class", "sorting"),
+    ("request", "transport", "network"),
+    ("timed_request", "", "network"),
+    ("get_class_grades", "", "parse"),
+    ("parse_login_text", "", "parse"),
+    ("result_iterator", "concurrent", "waiting"),
+] # type: List[Tuple[str, str, str]]
+
+def frame_label(frame: FrameType) -> str:
+    """Returns the collapsed-stack label of a frame.
+
+    Parameters
+    ----------
+    frame : FrameType
+        Frame to label.
+
+    Returns
+    -------
+    str
+        "function (file.py:line)".
+
+    """
+    code = frame.f_code
+    return "{0} ({1}:{2})".format(
+        code.co_name,
+        os.path.basename(code.co_filename),
+        code.co_firstlineno
+    )
+
+def classify(frames: List[FrameType]) -> str:
+    """Returns the stage a stack was sampled in.
+
+    Parameters
+    ----------
+    frames : List[FrameType]
+        Stack, outermost frame first.
+
+    Returns
+    -------
+    str
+        Stage name from STAGE_RULES, or "other".
+
+    """
+    for frame in reversed(frames):
+        name = frame.f_code.co_name
+        path = frame.f_code.co_filename
+        for function, fragment, stage in STAGE_RULES:
+            if name == function and fragment in path:
+                return stage
+    return "other"
+
+class SamplingProfiler():
+    """Profiles a random fraction of SkywardAPI calls by sampling their stacks.
+
+    While a sampled call runs, a background thread records the call's stack
+    every ``interval`` seconds, along with the stacks of any worker threads
+    running functions wrapped with bind() for it. Samples are kept as
+    collapsed stacks ("call;stage;outer;...;inner"), ready for flamegraph.pl
+    or speedscope, and summarized by stage and by function. Time the calling
+    thread spends waiting on its workers is its own "waiting" stage.
+
+    Parameters
+    ----------
+    rate : float
+        Fraction of calls to profile, from 0 to 1 (the default is 0.01).
+    interval : float
+        Seconds between samples of a profiled call (the default is 0.005).
+    chance : Callable[[], float]
+        Source of uniform random numbers in [0, 1) used to pick calls
+        (the default is random.random).
+
+    Attributes
+    ----------
+    calls : int
+        Calls seen.
+    profiled : int
+        Calls profiled.
+    stacks : Counter
+        Samples per collapsed stack.
+    stages : Counter
+        Samples per "call;stage".
+
+    """
+    def __init__(
+        self,
+        rate: float = 0.01,
+        interval: float = 0.005,
+        chance: Callable[[], float] = random.random
+    ) -> None:
+        if not 0 <= rate <= 1:
+            raise ValueError("rate must be between 0 and 1.")
+        if interval <= 0:
+            raise ValueError("interval must be positive.")
+        self.rate = rate
+        self.interval = interval
+        self.chance = chance
+        self.calls = 0
+        self.profiled = 0
+        self.stacks = collections.Counter() # type: collections.Counter
+        self.stages = collections.Counter() # type: collections.Counter
+        self._lock = threading.Lock()
+        self._active = threading.local()
+
+    @contextlib.contextmanager
+    def profile(self, call: str) -> Iterator[None]:
+        """Profiles the block if this call is picked.
+
+        Calls nested in a profiled call are part of its profile rather than
+        picked again.
+
+        Parameters
+        ----------
+        call : str
+            Name samples of the block are recorded under (e.g. "get_grades").
+
+        """
+        if getattr(self._active, "threads", None) is not None:
+            yield
+            return
+        with self._lock:
+            self.calls += 1
+            picked = self.chance() < self.rate
+            if picked:
+                self.profiled += 1
+        if not picked:
+            yield
+            return
+
+        threads = {threading.get_ident()}
+        self._active.call = call
+        self._active.threads = threads
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample,
+            args=(call, threads, stop),
+            daemon=True
+        )
+        sampler.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            sampler.join()
+            self._active.call = None
+            self._active.threads = None
+
+    def bind(self, function: Callable[..., Any]) -> Callable[..., Any]:
+        """Makes a function sampled as part of the current profiled call.
+
+        Wrap functions handed to a thread pool from inside a profiled call so
+        the time spent in the workers is sampled too.
+
+        Parameters
+        ----------
+        function : Callable[..., Any]
+            Function that will run in another thread.
+
+        Returns
+        -------
+        Callable[..., Any]
+            Wrapped function, or function itself if no call is being profiled
+            in this thread.
+
+        """
+        call = getattr(self._active, "call", None)
+        threads = getattr(self._active, "threads", None) # type: Optional[Set[int]]
+        if call is None or threads is None:
+            return function
+        profiled_threads = threads
+
+        def bound(*args: Any, **kwargs: Any) -> Any:
+            thread_id = threading.get_ident()
+            outer = (
+                getattr(self._active, "call", None),
+                getattr(self._active, "threads", None)
+            )
+            self._active.call = call
+            self._active.threads = profiled_threads
+            with self._lock:
+                profiled_threads.add(thread_id)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                with self._lock:
+                    profiled_threads.discard(thread_id)
+                self._active.call, self._active.threads = outer
+
+        return bound
+
+    def _sample(self, call: str, threads: Set[int], stop: threading.Event) -> None:
+        while not stop.wait(self.interval):
+            with self._lock:
+                thread_ids = list(threads)
+            current = sys._current_frames()
+            stacks = []
+            for thread_id in thread_ids:
+                frame = current.get(thread_id) # type: Optional[FrameType]
+                frames = []
+                while frame is not None:
+                    frames.append(frame)
+                    frame = frame.f_back
+                frames.reverse()
+                stacks.append(frames)
+            del current
+            if stop.is_set():
+                break
+            samples = []
+            for frames in stacks:
+                if not frames:
+                    continue
+                stage = classify(frames)
+                samples.append((stage, ";".join(
+                    [call, stage] + [frame_label(frame) for frame in frames]
+                )))
+            with self._lock:
+                for stage, stack in samples:
+                    self.stacks[stack] += 1
+                    self.stages["{0};{1}".format(call, stage)] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the collected samples in a JSON- and pickle-friendly form.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Counters and call counts, for merge().
+
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "profiled": self.profiled,
+                "stacks": dict(self.stacks),
+                "stages": dict(self.stages)
+            }
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        """Adds samples collected elsewhere, e.g. in a worker process.
+
+        Parameters
+        ----------
+        data : Dict[str, Any]
+            Result of another profiler's to_dict().
+
+        """
+        with self._lock:
+            self.calls += data["calls"]
+            self.profiled += data["profiled"]
+            self.stacks.update(data["stacks"])
+            self.stages.update(data["stages"])
+
+    def write_collapsed(self, output: IO[str]) -> None:
+        """Writes samples as collapsed stacks, one "stack count" per line.
+
+        Parameters
+        ----------
+        output : IO[str]
+            Stream to write to.
+
+        """
+        with self._lock:
+            stacks = sorted(self.stacks.items())
+        for stack, count in stacks:
+            output.write("{0} {1}\n".format(stack, count))
+
+    def top(self, n: int = 10) -> List[Tuple[str, int, int]]:
+        """Returns the functions with the most samples.
+
+        Parameters
+        ----------
+        n : int
+            Number of functions (the default is 10).
+
+        Returns
+        -------
+        List[Tuple[str, int, int]]
+            (function label, samples where it was running, samples where it
+            was on the stack), sorted by the first.
+
+        """
+        own = collections.Counter() # type: collections.Counter
+        total = collections.Counter() # type: collections.Counter
+        with self._lock:
+            stacks = list(self.stacks.items())
+        for stack, count in stacks:
+            labels = stack.split(";")[2:]
+            if labels:
+                own[labels[-1]] += count
+            for label in set(labels):
+                total[label] += count
+        ranked = sorted(total, key=lambda label: (-own[label], -total[label], label))
+        return [(label, own[label], total[label]) for label in ranked[:n]]
+
+    def summary(self, n: int = 10) -> str:
+        """Describes where sampled time went.
+
+        Parameters
+        ----------
+        n : int
+            Number of hot functions to list (the default is 10).
+
+        Returns
+        -------
+        str
+            Sample share per call and stage, then the top n functions.
+
+        """
+        with self._lock:
+            stages = sorted(self.stages.items(), key=lambda item: -item[1])
+            calls = self.calls
+            profiled = self.profiled
+        samples = sum(count for _, count in stages) or 1
+        lines = ["profiled {0} of {1} calls, {2} samples".format(
+            profiled,
+            calls,
+            sum(count for _, count in stages)
+        )]
+        for stage, count in stages:
+            lines.append("  {0:<30} {1:6.1%}".format(stage.replace(";", " / "), count / samples))
+        lines.append("top functions (self, total samples):")
+        for label, own, total in self.top(n):
+            lines.append("  {0:6d} {1:6d}  {2}".format(own, total, label))
+        return "\n".join(lines)
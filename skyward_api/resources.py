@@ -0,0 +1,381 @@
+import contextlib
+import gc
+import os
+import threading
+from typing import Dict, Iterator, List, Optional
+import psutil
+
+BROWSER_NAMES = ("chrom", "headless_shell")
+
+def is_browser(process: psutil.Process) -> bool:
+    """Returns whether a process is a Chromium process.
+
+    Parameters
+    ----------
+    process : psutil.Process
+        Process to check.
+
+    Returns
+    -------
+    bool
+        Whether the process name looks like Chromium.
+
+    """
+    try:
+        name = process.name().lower()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+    return any(browser in name for browser in BROWSER_NAMES)
+
+def top_level_browsers(processes: List[psutil.Process]) -> List[psutil.Process]:
+    """Filters out Chromium processes whose parent is also Chromium.
+
+    Parameters
+    ----------
+    processes : List[psutil.Process]
+        Chromium processes.
+
+    Returns
+    -------
+    List[psutil.Process]
+        Processes that started a browser, not its renderers or helpers.
+
+    """
+    top_level = []
+    for process in processes:
+        try:
+            parent = process.parent()
+        except psutil.NoSuchProcess:
+            continue
+        if parent is None or not is_browser(parent):
+            top_level.append(process)
+    return top_level
+
+class ResourceUsage():
+    """Resources held by a process at one moment.
+
+    Parameters
+    ----------
+    process : psutil.Process
+        Process to measure.
+
+    Attributes
+    ----------
+    rss : int
+        Resident memory of the process in bytes.
+    fds : int
+        Open file descriptors (handles on Windows).
+    connections : int
+        Open network connections.
+    browsers : List[int]
+        Pids of Chromium processes descended from the process.
+
+    """
+    def __init__(self, process: psutil.Process) -> None:
+        self.rss = process.memory_info().rss
+        if hasattr(process, "num_fds"):
+            self.fds = process.num_fds()
+        else:
+            self.fds = process.num_handles()
+        connections = getattr(process, "net_connections", None)
+        if connections is None:
+            connections = process.connections
+        self.connections = len(connections())
+        self.browsers = [
+            child.pid
+            for child in process.children(recursive=True)
+            if is_browser(child)
+        ]
+
+    def __str__(self) -> str:
+        return "rss {0:.1f} MiB, {1} fds, {2} connections, {3} browsers".format(
+            self.rss / 2 ** 20,
+            self.fds,
+            self.connections,
+            len(self.browsers)
+        )
+
+class StageResources():
+    """Resource changes accumulated over calls of one stage.
+
+    Attributes
+    ----------
+    calls : int
+        Number of tracked calls.
+    rss_delta : int
+        Total change in resident memory in bytes.
+    max_rss_delta : int
+        Largest change in resident memory over a single call.
+    fd_delta : int
+        Total change in open file descriptors.
+    connection_delta : int
+        Total change in open connections.
+    browser_delta : int
+        Total change in Chromium processes.
+
+    """
+    def __init__(self) -> None:
+        self.calls = 0
+        self.rss_delta = 0
+        self.max_rss_delta = 0
+        self.fd_delta = 0
+        self.connection_delta = 0
+        self.browser_delta = 0
+
+    def add(self, before: ResourceUsage, after: ResourceUsage) -> None:
+        """Adds the change over one call.
+
+        Parameters
+        ----------
+        before : ResourceUsage
+            Usage when the call started.
+        after : ResourceUsage
+            Usage when the call ended.
+
+        """
+        rss_delta = after.rss - before.rss
+        self.calls += 1
+        self.rss_delta += rss_delta
+        self.max_rss_delta = max(self.max_rss_delta, rss_delta)
+        self.fd_delta += after.fds - before.fds
+        self.connection_delta += after.connections - before.connections
+        self.browser_delta += len(after.browsers) - len(before.browsers)
+
+    def __str__(self) -> str:
+        return (
+            "{0} calls, rss {1:+.1f} MiB (max {2:+.1f} MiB), {3:+d} fds, "
+            "{4:+d} connections, {5:+d} browsers"
+        ).format(
+            self.calls,
+            self.rss_delta / 2 ** 20,
+            self.max_rss_delta / 2 ** 20,
+            self.fd_delta,
+            self.connection_delta,
+            self.browser_delta
+        )
+
+class ResourceMonitor():
+    """Tracks and limits resources used by SkywardAPI calls.
+
+    One monitor can be given to a single SkywardAPI or shared by every api
+    in a batch. Calls wrapped in track() record how much memory, descriptors,
+    connections and Chromium processes they left behind, and enforce() is
+    run after each of them. Excess browsers are only reaped when no tracked
+    call is running, so apis sharing the monitor from other threads never
+    lose a browser they are rendering with.
+
+    Parameters
+    ----------
+    max_browsers : Optional[int]
+        Most Chromium processes that may stay alive under this process while
+        no tracked call is running; the oldest extra ones are reaped (the
+        default is None, no limit).
+    max_rss : Optional[int]
+        Resident memory in bytes above which a garbage collection is forced
+        (the default is None, no limit).
+    reap_orphans : bool
+        Whether to reap headless Chromium processes of this user that were
+        orphaned by a dead parent (the default is True).
+    process : Optional[psutil.Process]
+        Process to monitor (the default is None, the current process).
+
+    Attributes
+    ----------
+    stages : Dict[str, StageResources]
+        Resource changes per tracked stage.
+    reaped : int
+        Number of Chromium processes reaped so far.
+    running : int
+        Number of tracked calls in progress.
+
+    """
+    def __init__(
+        self,
+        max_browsers: Optional[int] = None,
+        max_rss: Optional[int] = None,
+        reap_orphans: bool = True,
+        process: Optional[psutil.Process] = None
+    ) -> None:
+        self.max_browsers = max_browsers
+        self.max_rss = max_rss
+        self.reap_orphans = reap_orphans
+        self.process = process or psutil.Process()
+        self.stages = {} # type: Dict[str, StageResources]
+        self.reaped = 0
+        self.running = 0
+        self._lock = threading.RLock()
+
+    def usage(self) -> ResourceUsage:
+        """Measures the monitored process now.
+
+        Returns
+        -------
+        ResourceUsage
+            Current usage.
+
+        """
+        return ResourceUsage(self.process)
+
+    @contextlib.contextmanager
+    def track(self, stage: str) -> Iterator[None]:
+        """Records resource changes over the block and enforces limits after it.
+
+        Parameters
+        ----------
+        stage : str
+            Name the changes are recorded under.
+
+        """
+        with self._lock:
+            self.running += 1
+        before = self.usage()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.running -= 1
+            self.enforce()
+            after = self.usage()
+            with self._lock:
+                self.stages.setdefault(stage, StageResources()).add(before, after)
+
+    def browsers(self) -> List[psutil.Process]:
+        """Returns Chromium processes descended from the monitored process.
+
+        Returns
+        -------
+        List[psutil.Process]
+            Chromium processes, oldest first.
+
+        """
+        browsers = []
+        for child in self.process.children(recursive=True):
+            try:
+                if is_browser(child):
+                    browsers.append((child.create_time(), child.pid, child))
+            except psutil.NoSuchProcess:
+                continue
+        return [browser for _, _, browser in sorted(browsers)]
+
+    def orphaned_browsers(self) -> List[psutil.Process]:
+        """Returns headless Chromium processes left behind by dead parents.
+
+        Only top-level browsers of the current user that were launched by
+        pyppeteer and reparented to init or a systemd subreaper are returned;
+        reaping them takes their renderers along. Browsers started by the
+        monitored process are never orphans, even when it is itself pid 1
+        (e.g. in a container).
+
+        Returns
+        -------
+        List[psutil.Process]
+            Orphaned Chromium processes.
+
+        """
+        username = self.process.username()
+        orphans = []
+        for process in psutil.process_iter():
+            try:
+                if not is_browser(process) or process.username() != username:
+                    continue
+                parent = process.parent()
+                if parent is not None and parent.pid == self.process.pid:
+                    continue
+                if parent is not None and parent.pid != 1:
+                    if not parent.name().startswith("systemd"):
+                        continue
+                if "pyppeteer" not in " ".join(process.cmdline()):
+                    continue
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            orphans.append(process)
+        return orphans
+
+    def reap(self, processes: List[psutil.Process], timeout: float = 3) -> int:
+        """Terminates processes and their children, killing stragglers.
+
+        Parameters
+        ----------
+        processes : List[psutil.Process]
+            Processes to reap.
+        timeout : float
+            Seconds to wait for them to exit before killing (the default is 3).
+
+        Returns
+        -------
+        int
+            Number of processes that were reaped.
+
+        """
+        targets = {} # type: Dict[int, psutil.Process]
+        for process in processes:
+            try:
+                for child in process.children(recursive=True):
+                    targets[child.pid] = child
+            except psutil.NoSuchProcess:
+                pass
+            targets[process.pid] = process
+        targets.pop(os.getpid(), None)
+        for process in targets.values():
+            try:
+                process.terminate()
+            except psutil.NoSuchProcess:
+                pass
+        gone, alive = psutil.wait_procs(list(targets.values()), timeout=timeout)
+        for process in alive:
+            try:
+                process.kill()
+            except psutil.NoSuchProcess:
+                pass
+        psutil.wait_procs(alive, timeout=timeout)
+        with self._lock:
+            self.reaped += len(targets)
+        return len(targets)
+
+    def enforce(self) -> Dict[str, int]:
+        """Applies the monitor's limits.
+
+        Excess browsers are left alone while any tracked call is running.
+
+        Returns
+        -------
+        Dict[str, int]
+            Number of processes reaped as "orphans" and "excess_browsers", and
+            whether a collection was forced for memory as "gc".
+
+        """
+        report = {"orphans": 0, "excess_browsers": 0, "gc": 0}
+        if self.reap_orphans:
+            orphans = self.orphaned_browsers()
+            if orphans:
+                report["orphans"] = self.reap(orphans)
+        if self.max_browsers is not None:
+            # Holding the lock keeps new tracked calls from starting a render
+            # while their browsers could be picked for reaping.
+            with self._lock:
+                if self.running == 0:
+                    browsers = top_level_browsers(self.browsers())
+                    excess = len(browsers) - self.max_browsers
+                    if excess > 0:
+                        report["excess_browsers"] = self.reap(browsers[:excess])
+        if self.max_rss is not None and self.process.memory_info().rss > self.max_rss:
+            gc.collect()
+            report["gc"] = 1
+        return report
+
+    def summary(self) -> str:
+        """Describes resource changes per stage and current usage.
+
+        Returns
+        -------
+        str
+            One line per stage, then the current usage.
+
+        """
+        with self._lock:
+            lines = [
+                "{0}: {1}".format(stage, resources)
+                for stage, resources in sorted(self.stages.items())
+            ]
+        lines.append("now: {0}, {1} reaped".format(self.usage(), self.reaped))
+        return "\n".join(lines)
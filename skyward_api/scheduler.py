@@ -0,0 +1,421 @@
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from skyward_api.API import SkywardAPI
+from skyward_api.skyward_class import SkywardClass
+
+class GradeChange():
+    """Change observed in a single class between two polls.
+
+    Parameters
+    ----------
+    student : str
+        Key the student was registered under.
+    title : str
+        Skyward title of the class that changed.
+    added : SkywardClass
+        Grades present in the new poll but not the previous one.
+    removed : SkywardClass
+        Grades present in the previous poll but not the new one.
+
+    Attributes
+    ----------
+    student : str
+        Key the student was registered under.
+    title : str
+        Skyward title of the class that changed.
+    added : SkywardClass
+        Grades present in the new poll but not the previous one.
+    removed : SkywardClass
+        Grades present in the previous poll but not the new one.
+
+    """
+    def __init__(
+        self,
+        student: str,
+        title: str,
+        added: SkywardClass,
+        removed: SkywardClass
+    ) -> None:
+        self.student = student
+        self.title = title
+        self.added = added
+        self.removed = removed
+
+    def __str__(self) -> str:
+        return "{0}: {1} (+{2} -{3})".format(
+            self.student,
+            self.title,
+            len(self.added.grades),
+            len(self.removed.grades)
+        )
+
+class StudentWatch():
+    """Polling state of a single student.
+
+    Parameters
+    ----------
+    key : str
+        Key the student is registered under.
+    api : Optional[SkywardAPI]
+        Logged-in api used to poll the student, or None to call connect on
+        the first poll.
+    interval : float
+        Initial poll interval in seconds.
+    connect : Optional[Callable[[], SkywardAPI]]
+        Returns a logged-in api; used when api is None (the default is None).
+    gate : Optional[Callable[[str], bool]]
+        Called with the key before each poll; the poll is skipped when it
+        returns False (the default is None).
+
+    Attributes
+    ----------
+    key : str
+        Key the student is registered under.
+    api : Optional[SkywardAPI]
+        Logged-in api used to poll the student, once known.
+    interval : float
+        Current poll interval in seconds.
+    class_intervals : Dict[str, float]
+        Poll interval each class would need on its own, keyed by Skyward title.
+    grades : Dict[str, SkywardClass]
+        Result of the last poll, keyed by Skyward title. Classes appearing in
+        both semesters are merged.
+    next_poll : float
+        Clock time the student is next due.
+    polls : int
+        Number of completed polls.
+    changes : int
+        Number of polls that observed a change.
+
+    """
+    def __init__(
+        self,
+        key: str,
+        api: Optional[SkywardAPI],
+        interval: float,
+        connect: Optional[Callable[[], SkywardAPI]] = None,
+        gate: Optional[Callable[[str], bool]] = None
+    ) -> None:
+        self.key = key
+        self.api = api
+        self.interval = interval
+        self.connect = connect
+        self.gate = gate
+        self.class_intervals = {} # type: Dict[str, float]
+        self.grades = None # type: Optional[Dict[str, SkywardClass]]
+        self.next_poll = 0.0
+        self.polls = 0
+        self.changes = 0
+
+    def get_api(self) -> SkywardAPI:
+        """Returns the student's api, connecting on first use.
+
+        Returns
+        -------
+        SkywardAPI
+            Logged-in api.
+
+        Raises
+        -------
+        ValueError
+            The student has neither an api nor a connect function.
+
+        """
+        if self.api is None:
+            if self.connect is None:
+                raise ValueError("Student {0} has no api.".format(self.key))
+            self.api = self.connect()
+        return self.api
+
+class PollScheduler():
+    """Polls students on intervals adapted to how often their grades change.
+
+    Every class keeps its own interval, which shrinks by ``speedup`` when a
+    poll observes a change in it and grows by ``backoff`` when it does not.
+    A student is polled as often as its most active class needs, clamped to
+    ``[min_interval, max_interval]``. Due students are kept in a heap ordered
+    by their next poll time.
+
+    Parameters
+    ----------
+    on_change : Callable[[GradeChange], None]
+        Called once per changed class after each poll.
+    min_interval : float
+        Shortest allowed poll interval in seconds (the default is 300).
+    max_interval : float
+        Longest allowed poll interval in seconds (the default is 86400).
+    initial_interval : float
+        Interval new students and classes start at (the default is 3600).
+    backoff : float
+        Factor an unchanged class's interval grows by (the default is 1.5).
+    speedup : float
+        Factor a changed class's interval shrinks by (the default is 0.5).
+    on_error : Optional[Callable[[str, Exception], None]]
+        Called with the student key when a poll raises. If not given, the
+        error propagates out of run_pending (the default is None).
+    clock : Callable[[], float]
+        Source of the current time (the default is time.monotonic).
+    sleep : Callable[[float], None]
+        Function used to wait for the next due student (the default is
+        time.sleep).
+
+    Raises
+    -------
+    ValueError
+        Intervals or factors are out of range.
+
+    """
+    def __init__(
+        self,
+        on_change: Callable[[GradeChange], None],
+        min_interval: float = 300,
+        max_interval: float = 86400,
+        initial_interval: float = 3600,
+        backoff: float = 1.5,
+        speedup: float = 0.5,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Need 0 < min_interval <= max_interval.")
+        if backoff < 1 or not 0 < speedup <= 1:
+            raise ValueError("Need backoff >= 1 and 0 < speedup <= 1.")
+        self.on_change = on_change
+        self.on_error = on_error
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = self._clamp(initial_interval)
+        self.backoff = backoff
+        self.speedup = speedup
+        self.clock = clock
+        self.sleep = sleep
+        self.students = {} # type: Dict[str, StudentWatch]
+        self._queue = [] # type: List[Tuple[float, int, str]]
+        self._counter = 0
+
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _push(self, watch: StudentWatch) -> None:
+        self._counter += 1
+        heapq.heappush(self._queue, (watch.next_poll, self._counter, watch.key))
+
+    def add_student(
+        self,
+        key: str,
+        api: Optional[SkywardAPI] = None,
+        poll_now: bool = True,
+        connect: Optional[Callable[[], SkywardAPI]] = None,
+        gate: Optional[Callable[[str], bool]] = None
+    ) -> None:
+        """Starts watching a student.
+
+        Parameters
+        ----------
+        key : str
+            Unique key for the student (e.g. username).
+        api : Optional[SkywardAPI]
+            Logged-in api used to poll the student (the default is None).
+        poll_now : bool
+            Whether the first poll is due immediately (the default is True).
+            Otherwise it is due after the initial interval.
+        connect : Optional[Callable[[], SkywardAPI]]
+            Returns a logged-in api. Called on the first poll when api is not
+            given, so slow logins happen while polling instead of here
+            (the default is None).
+        gate : Optional[Callable[[str], bool]]
+            Called with key before each poll. When it returns False the poll
+            is skipped and the student is checked again after its interval
+            (the default is None, always poll).
+
+        Raises
+        -------
+        ValueError
+            A student is already registered under key, or neither api nor
+            connect was given.
+
+        """
+        if key in self.students:
+            raise ValueError("Student {0} is already being watched.".format(key))
+        if api is None and connect is None:
+            raise ValueError("Need an api or a connect function.")
+        watch = StudentWatch(key, api, self.initial_interval, connect, gate)
+        watch.next_poll = self.clock()
+        if not poll_now:
+            watch.next_poll += watch.interval
+        self.students[key] = watch
+        self._push(watch)
+
+    def remove_student(self, key: str) -> None:
+        """Stops watching a student. Unknown keys are ignored.
+
+        Parameters
+        ----------
+        key : str
+            Key the student was registered under.
+
+        """
+        self.students.pop(key, None)
+
+    def next_due(self) -> Optional[float]:
+        """Returns the clock time of the next due poll.
+
+        Returns
+        -------
+        Optional[float]
+            Clock time of the next poll, or None if nobody is watched.
+
+        """
+        while self._queue:
+            due, _, key = self._queue[0]
+            watch = self.students.get(key)
+            if watch is not None and watch.next_poll == due:
+                return due
+            heapq.heappop(self._queue)
+            # Entry is stale: student was removed or rescheduled.
+        return None
+
+    @staticmethod
+    def _merge_classes(grades: List[SkywardClass]) -> Dict[str, SkywardClass]:
+        merged = {} # type: Dict[str, SkywardClass]
+        for sky_class in grades:
+            title = sky_class.skyward_title()
+            if title in merged:
+                merged[title] = merged[title] + sky_class
+            else:
+                merged[title] = sky_class
+        return merged
+
+    def _diff(
+        self,
+        watch: StudentWatch,
+        new: Dict[str, SkywardClass]
+    ) -> List[GradeChange]:
+        old = watch.grades
+        if old is None:
+            return []
+        changes = []
+        for title in set(old) | set(new):
+            new_class = new.get(title, SkywardClass(title, []))
+            old_class = old.get(title, SkywardClass(title, []))
+            added = new_class - old_class
+            removed = old_class - new_class
+            if added.grades or removed.grades:
+                changes.append(GradeChange(watch.key, title, added, removed))
+        return changes
+
+    def _adapt(self, watch: StudentWatch, changes: List[GradeChange]) -> None:
+        changed = set(change.title for change in changes)
+        titles = set(watch.grades or {}) | set(watch.class_intervals)
+        intervals = {}
+        for title in titles:
+            interval = watch.class_intervals.get(title, self.initial_interval)
+            if title in changed:
+                interval *= self.speedup
+            else:
+                interval *= self.backoff
+            intervals[title] = self._clamp(interval)
+        watch.class_intervals = intervals
+        if intervals:
+            watch.interval = min(intervals.values())
+        else:
+            watch.interval = self._clamp(watch.interval * self.backoff)
+
+    def poll(self, key: str) -> List[GradeChange]:
+        """Polls a student right away and reschedules it.
+
+        Parameters
+        ----------
+        key : str
+            Key the student was registered under.
+
+        Returns
+        -------
+        List[GradeChange]
+            Changes since the previous poll. The first poll reports none, and
+            so does a poll skipped by the student's gate.
+
+        Raises
+        -------
+        KeyError
+            No student is registered under key.
+        SkywardError
+            Unable to get grades (from get_grades) or to log in (from the
+            student's connect function).
+
+        """
+        watch = self.students[key]
+        if watch.gate is not None and not watch.gate(key):
+            watch.next_poll = self.clock() + watch.interval
+            self._push(watch)
+            return []
+        try:
+            new = self._merge_classes(watch.get_api().get_grades())
+        except Exception:
+            watch.next_poll = self.clock() + watch.interval
+            self._push(watch)
+            raise
+        changes = self._diff(watch, new)
+        first_poll = watch.grades is None
+        watch.grades = new
+        watch.polls += 1
+        if changes:
+            watch.changes += 1
+        if not first_poll:
+            self._adapt(watch, changes)
+        watch.next_poll = self.clock() + watch.interval
+        self._push(watch)
+        for change in changes:
+            self.on_change(change)
+        return changes
+
+    def run_pending(self) -> int:
+        """Polls every student that is currently due.
+
+        Returns
+        -------
+        int
+            Number of students polled.
+
+        Raises
+        -------
+        SkywardError
+            A poll failed and no on_error callback was given.
+
+        """
+        now = self.clock()
+        polled = 0
+        while True:
+            due = self.next_due()
+            if due is None or due > now:
+                break
+            _, _, key = heapq.heappop(self._queue)
+            polled += 1
+            try:
+                self.poll(key)
+            except Exception as e:
+                if self.on_error is None:
+                    raise
+                self.on_error(key, e)
+        return polled
+
+    def run(self, until: Optional[Callable[[], bool]] = None) -> None:
+        """Polls students as they become due.
+
+        Parameters
+        ----------
+        until : Optional[Callable[[], bool]]
+            Checked after every round of polls; returning True stops the loop.
+            If not given, runs while any student is watched (the default is None).
+
+        """
+        while until is None or not until():
+            due = self.next_due()
+            if due is None:
+                return
+            wait = due - self.clock()
+            if wait > 0:
+                self.sleep(wait)
+            self.run_pending()
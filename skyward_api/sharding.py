@@ -0,0 +1,436 @@
+import abc
+import bisect
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from skyward_api.API import SkywardAPI
+from skyward_api.errors import SessionError
+from skyward_api.scheduler import PollScheduler
+
+def _hash(key: str) -> int:
+    return int(hashlib.md5(key.encode("utf-8")).hexdigest()[:16], 16)
+
+class HashRing():
+    """Consistent hash ring mapping account keys to nodes.
+
+    Parameters
+    ----------
+    nodes : Iterable[str]
+        Node ids on the ring.
+    replicas : int
+        Points each node gets on the ring; more points spread accounts more
+        evenly (the default is 64).
+
+    """
+    def __init__(self, nodes: Iterable[str], replicas: int = 64) -> None:
+        points = sorted(
+            (_hash("{0}#{1}".format(node, replica)), node)
+            for node in set(nodes)
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key: str) -> Optional[str]:
+        """Returns the node that owns a key.
+
+        Parameters
+        ----------
+        key : str
+            Account key.
+
+        Returns
+        -------
+        Optional[str]
+            Owning node, or None if the ring is empty.
+
+        """
+        if not self._nodes:
+            return None
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+class LeaseBackend(abc.ABC):
+    """Shared store of node liveness, account leases and handed-over sessions.
+
+    Implementations must make acquire and store_session atomic across every
+    node using the backend. Times are seconds since the epoch.
+
+    """
+    @abc.abstractmethod
+    def heartbeat(self, node: str, ttl: float) -> None:
+        """Marks a node alive for ttl seconds."""
+
+    @abc.abstractmethod
+    def leave(self, node: str) -> None:
+        """Marks a node as gone and drops its leases."""
+
+    @abc.abstractmethod
+    def live_nodes(self) -> List[str]:
+        """Returns nodes whose heartbeat has not expired."""
+
+    @abc.abstractmethod
+    def acquire(self, account: str, node: str, ttl: float) -> bool:
+        """Takes or renews a lease on an account for ttl seconds.
+
+        Succeeds if the account is unleased, its lease expired, or node
+        already holds it.
+        """
+
+    @abc.abstractmethod
+    def release(self, account: str, node: str) -> None:
+        """Gives up node's lease on an account, if it holds one."""
+
+    @abc.abstractmethod
+    def owner(self, account: str) -> Optional[str]:
+        """Returns the node holding an unexpired lease on an account."""
+
+    @abc.abstractmethod
+    def store_session(
+        self,
+        account: str,
+        session_params: Dict[str, str],
+        node: str
+    ) -> bool:
+        """Saves an account's session params for whoever owns it next.
+
+        Only saves, and returns True, if node holds an unexpired lease on the
+        account, so a node whose lease lapsed cannot overwrite the session of
+        the account's new owner.
+        """
+
+    @abc.abstractmethod
+    def load_session(self, account: str) -> Optional[Dict[str, str]]:
+        """Returns the last saved session params of an account."""
+
+class SQLiteLeaseBackend(LeaseBackend):
+    """LeaseBackend in a SQLite file, for nodes on a single host and for tests.
+
+    Parameters
+    ----------
+    path : str
+        Database file shared by the nodes, or ":memory:" for one process.
+    clock : Callable[[], float]
+        Source of the current time (the default is time.time).
+
+    """
+    def __init__(self, path: str, clock: Callable[[], float] = time.time) -> None:
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+        with self._lock:
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS nodes (
+                    node TEXT PRIMARY KEY, expires REAL NOT NULL);
+                CREATE TABLE IF NOT EXISTS leases (
+                    account TEXT PRIMARY KEY, node TEXT NOT NULL,
+                    expires REAL NOT NULL);
+                CREATE TABLE IF NOT EXISTS sessions (
+                    account TEXT PRIMARY KEY, params TEXT NOT NULL);
+            """)
+
+    def _write(self, statements: List[Tuple[str, Tuple[Any, ...]]]) -> List[int]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                changed = [
+                    self._db.execute(sql, args).rowcount
+                    for sql, args in statements
+                ]
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return changed
+
+    def _read(self, sql: str, args: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def heartbeat(self, node: str, ttl: float) -> None:
+        self._write([(
+            "INSERT OR REPLACE INTO nodes (node, expires) VALUES (?, ?)",
+            (node, self.clock() + ttl)
+        )])
+
+    def leave(self, node: str) -> None:
+        self._write([
+            ("DELETE FROM nodes WHERE node = ?", (node,)),
+            ("DELETE FROM leases WHERE node = ?", (node,))
+        ])
+
+    def live_nodes(self) -> List[str]:
+        rows = self._read(
+            "SELECT node FROM nodes WHERE expires > ? ORDER BY node",
+            (self.clock(),)
+        )
+        return [node for node, in rows]
+
+    def acquire(self, account: str, node: str, ttl: float) -> bool:
+        now = self.clock()
+        changed = self._write([(
+            """INSERT INTO leases (account, node, expires) VALUES (?, ?, ?)
+               ON CONFLICT (account) DO UPDATE
+               SET node = excluded.node, expires = excluded.expires
+               WHERE leases.node = excluded.node OR leases.expires <= ?""",
+            (account, node, now + ttl, now)
+        )])
+        return changed[0] > 0
+
+    def release(self, account: str, node: str) -> None:
+        self._write([(
+            "DELETE FROM leases WHERE account = ? AND node = ?",
+            (account, node)
+        )])
+
+    def owner(self, account: str) -> Optional[str]:
+        rows = self._read(
+            "SELECT node FROM leases WHERE account = ? AND expires > ?",
+            (account, self.clock())
+        )
+        return rows[0][0] if rows else None
+
+    def store_session(
+        self,
+        account: str,
+        session_params: Dict[str, str],
+        node: str
+    ) -> bool:
+        changed = self._write([(
+            """INSERT OR REPLACE INTO sessions (account, params)
+               SELECT ?, ? WHERE EXISTS (
+                   SELECT 1 FROM leases
+                   WHERE account = ? AND node = ? AND expires > ?)""",
+            (account, json.dumps(session_params), account, node, self.clock())
+        )])
+        return changed[0] > 0
+
+    def load_session(self, account: str) -> Optional[Dict[str, str]]:
+        rows = self._read(
+            "SELECT params FROM sessions WHERE account = ?",
+            (account,)
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._db.close()
+
+class ShardCoordinator():
+    """Spreads accounts over poller nodes with consistent hashing and leases.
+
+    Every node runs a coordinator over the same accounts and backend and calls
+    rebalance() well within ``ttl`` seconds of the last call. Each account is
+    hashed onto the ring of live nodes; a node only polls accounts it holds an
+    unexpired lease on, so an account moves only after its old owner released
+    it or its lease expired. rebalance() never logs in: gained accounts are
+    added to the scheduler with a connect function, so they are logged in on
+    their first poll, and with owns() as their gate, so a node skips polls of
+    accounts whose lease it no longer holds. Session params are saved to the
+    backend after login and on release while the lease is held, so the next
+    owner can resume the session instead of logging in again.
+
+    Parameters
+    ----------
+    node : str
+        Id of this node.
+    backend : LeaseBackend
+        Backend shared by all nodes.
+    accounts : Dict[str, Dict[str, Any]]
+        Account records keyed by account id, each with "service" and either
+        "username"/"password" or "session" (the same records skyward-export
+        reads).
+    ttl : float
+        Seconds a heartbeat or lease lasts (the default is 30).
+    replicas : int
+        Points per node on the hash ring (the default is 64).
+    scheduler : Optional[PollScheduler]
+        Scheduler to add gained accounts to and remove lost accounts from
+        (the default is None). Login errors surface from its polls.
+    api_options : Optional[Dict[str, Any]]
+        Extra keyword arguments for from_username_password and
+        from_session_data, e.g. transport (the default is None).
+
+    Attributes
+    ----------
+    apis : Dict[str, SkywardAPI]
+        Logged-in apis of the accounts this node owns.
+
+    """
+    def __init__(
+        self,
+        node: str,
+        backend: LeaseBackend,
+        accounts: Dict[str, Dict[str, Any]],
+        ttl: float = 30,
+        replicas: int = 64,
+        scheduler: Optional[PollScheduler] = None,
+        api_options: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self.node = node
+        self.backend = backend
+        self.accounts = accounts
+        self.ttl = ttl
+        self.replicas = replicas
+        self.scheduler = scheduler
+        self.api_options = api_options or {}
+        self.apis = {} # type: Dict[str, SkywardAPI]
+        self._leases = {} # type: Dict[str, float]
+
+    def owns(self, account: str) -> bool:
+        """Returns whether this node may poll an account right now.
+
+        Parameters
+        ----------
+        account : str
+            Account id.
+
+        Returns
+        -------
+        bool
+            Whether this node's lease on the account is unexpired.
+
+        """
+        expires = self._leases.get(account)
+        return expires is not None and time.monotonic() < expires
+
+    def owned(self) -> List[str]:
+        """Returns the accounts this node may poll right now.
+
+        Returns
+        -------
+        List[str]
+            Account ids.
+
+        """
+        return sorted(account for account in self._leases if self.owns(account))
+
+    def api(self, account: str) -> SkywardAPI:
+        """Returns a logged-in api for an owned account.
+
+        Resumes the session handed over by the previous owner if there is one
+        and it is still valid, otherwise logs in and saves the new session.
+
+        Parameters
+        ----------
+        account : str
+            Account id.
+
+        Returns
+        -------
+        SkywardAPI
+            Logged-in api.
+
+        Raises
+        -------
+        ValueError
+            This node does not own the account.
+        SkywardError
+            Unable to log in (from from_username_password).
+
+        """
+        if not self.owns(account):
+            raise ValueError("Node {0} does not own {1}.".format(self.node, account))
+        api = self.apis.get(account)
+        if api is not None:
+            return api
+        record = self.accounts[account]
+        session_params = self.backend.load_session(account) or record.get("session")
+        api = None
+        if session_params:
+            try:
+                api = SkywardAPI.from_session_data(
+                    record["service"],
+                    dict(session_params),
+                    **self.api_options
+                )
+            except SessionError:
+                if "username" not in record:
+                    raise
+        if api is None:
+            api = SkywardAPI.from_username_password(
+                record["username"],
+                record["password"],
+                record["service"],
+                **self.api_options
+            )
+        self.backend.store_session(account, api.session_params, self.node)
+        self.apis[account] = api
+        return api
+
+    def _gain(self, account: str) -> None:
+        if self.scheduler is not None and account not in self.scheduler.students:
+            self.scheduler.add_student(
+                account,
+                connect=functools.partial(self.api, account),
+                gate=self.owns
+            )
+
+    def _lose(self, account: str) -> None:
+        self._leases.pop(account, None)
+        api = self.apis.pop(account, None)
+        if api is not None:
+            # Ignored by the backend if the lease lapsed and another node
+            # may already have saved a newer session.
+            self.backend.store_session(account, api.session_params, self.node)
+        self.backend.release(account, self.node)
+        if self.scheduler is not None:
+            self.scheduler.remove_student(account)
+
+    def rebalance(self) -> Tuple[List[str], List[str]]:
+        """Heartbeats, renews leases and moves accounts to match the live nodes.
+
+        Returns
+        -------
+        Tuple[List[str], List[str]]
+            Accounts gained and accounts lost by this node.
+
+        Side Effects
+        ------------
+        With a scheduler, gained accounts are added to it, to be logged in
+        on their first poll, and lost accounts are removed from it.
+
+        """
+        started = time.monotonic()
+        self.backend.heartbeat(self.node, self.ttl)
+        nodes = self.backend.live_nodes()
+        if self.node not in nodes:
+            nodes.append(self.node)
+        ring = HashRing(nodes, self.replicas)
+
+        gained = []
+        lost = []
+        for account in sorted(self.accounts):
+            had = account in self._leases
+            mine = ring.node_for(account) == self.node
+            if mine and self.backend.acquire(account, self.node, self.ttl):
+                self._leases[account] = started + self.ttl
+                if not had:
+                    gained.append(account)
+            elif had:
+                lost.append(account)
+                # Either the ring moved it, or our lease lapsed and another
+                # node took it.
+        for account in lost:
+            self._lose(account)
+        for account in gained:
+            self._gain(account)
+        return gained, lost
+
+    def leave(self) -> None:
+        """Releases every account, handing sessions over, and leaves the cluster.
+
+        Side Effects
+        ------------
+        With a scheduler, every owned account is removed from it.
+
+        """
+        for account in list(self._leases):
+            self._lose(account)
+        self.backend.leave(self.node)
@@ -1,5 +1,33 @@
-from typing import Dict, List, Union
+import bisect
+import datetime
+from typing import Dict, List, Optional, Tuple, Union
 from skyward_api.assignment import Assignment
+from skyward_api.intern import intern
+
+_date_ordinals = {} # type: Dict[str, int]
+
+def date_ordinal(date: Union[str, datetime.date]) -> int:
+    """Converts a Skyward date to a proleptic Gregorian ordinal.
+
+    Parameters
+    ----------
+    date : Union[str, datetime.date]
+        Date as "MM/DD/YYYY" or a date object.
+
+    Returns
+    -------
+    int
+        Ordinal of the date.
+
+    """
+    if isinstance(date, datetime.date):
+        return date.toordinal()
+    ordinal = _date_ordinals.get(date)
+    if ordinal is None:
+        ordinal = datetime.datetime.strptime(date, "%m/%d/%Y").toordinal()
+        if len(_date_ordinals) < 4096:
+            _date_ordinals[date] = ordinal
+    return ordinal
 
 class SkywardClass():
     """Object for class with grades.
@@ -20,7 +48,9 @@ class SkywardClass():
     teacher : type
         Teacher of class (e.g. "TEACHER NAME").
     grades : type
-        Grades in the class.
+        Grades in the class. Lookups are built on first use; append through
+        add_grade, or call reindex after changing it directly, so they stay
+        in sync.
 
     """
     def __init__(self, name: str, grades: List[Assignment]) -> None:
@@ -30,10 +60,84 @@ class SkywardClass():
         period = int(split_2[0].replace("Period ", ""))
         teacher = split_2[1]
 
-        self.class_name = class_name
+        self.class_name = intern(class_name)
         self.period = period
-        self.teacher = teacher
+        self.teacher = intern(teacher)
         self.grades = grades
+        self._title = ""
+        self._title_key = None # type: Optional[Tuple[str, int, str]]
+        self._indexed = False
+
+    @staticmethod
+    def from_parts(
+        class_name: str,
+        period: int,
+        teacher: str,
+        grades: List[Assignment]
+    ) -> "SkywardClass":
+        """Builds a SkywardClass from already parsed title parts.
+
+        Parameters
+        ----------
+        class_name : str
+            Name of the class (e.g. "CLASS NAME").
+        period : int
+            Period of class (e.g. #).
+        teacher : str
+            Teacher of class (e.g. "TEACHER NAME").
+        grades : List[Assignment]
+            Grades in the class.
+
+        Returns
+        -------
+        SkywardClass
+            Class equal to one built from its Skyward title.
+
+        """
+        sky_class = SkywardClass.__new__(SkywardClass)
+        sky_class.class_name = intern(class_name)
+        sky_class.period = period
+        sky_class.teacher = intern(teacher)
+        sky_class.grades = grades
+        sky_class._title = ""
+        sky_class._title_key = None
+        sky_class._indexed = False
+        return sky_class
+
+    def reindex(self) -> None:
+        """Rebuilds the grade lookups from self.grades.
+
+        Side-Effects
+        ------------
+        Name, letter grade and date lookups are rebuilt.
+
+        """
+        self._by_name = {} # type: Dict[str, List[Assignment]]
+        self._by_letter = {} # type: Dict[str, List[Assignment]]
+        for grade in self.grades:
+            self._by_name.setdefault(grade.name, []).append(grade)
+            self._by_letter.setdefault(grade.letter_grade, []).append(grade)
+        keyed = sorted(
+            ((date_ordinal(grade.date), number), grade)
+            for number, grade in enumerate(self.grades)
+        )
+        self._date_keys = [key for key, _ in keyed] # type: List[Tuple[int, int]]
+        self._date_grades = [grade for _, grade in keyed] # type: List[Assignment]
+        self._added = len(self.grades)
+        self._indexed = True
+
+    def _ensure_index(self) -> None:
+        if not self._indexed:
+            self.reindex()
+
+    def _index_grade(self, grade: Assignment) -> None:
+        self._by_name.setdefault(grade.name, []).append(grade)
+        self._by_letter.setdefault(grade.letter_grade, []).append(grade)
+        key = (date_ordinal(grade.date), self._added)
+        self._added += 1
+        position = bisect.bisect(self._date_keys, key)
+        self._date_keys.insert(position, key)
+        self._date_grades.insert(position, grade)
 
     def add_grade(self, grade: Assignment) -> None:
         """Adds a grade to class grades.
@@ -45,10 +149,77 @@ class SkywardClass():
 
         Side-Effects
         ------------
-        Grade is added to self.grades.
+        Grade is added to self.grades and the grade lookups.
 
         """
         self.grades.append(grade)
+        if self._indexed:
+            self._index_grade(grade)
+
+    def grades_named(self, name: str) -> List[Assignment]:
+        """Returns grades with the given assignment name.
+
+        Parameters
+        ----------
+        name : str
+            Assignment name.
+
+        Returns
+        -------
+        List[Assignment]
+            Grades with that name, in the order they were added.
+
+        """
+        self._ensure_index()
+        return list(self._by_name.get(name, []))
+
+    def grades_with_letter(self, letter_grade: str) -> List[Assignment]:
+        """Returns grades with the given letter grade.
+
+        Parameters
+        ----------
+        letter_grade : str
+            Letter grade (e.g. "A", or "*" for ungraded).
+
+        Returns
+        -------
+        List[Assignment]
+            Grades with that letter grade, in the order they were added.
+
+        """
+        self._ensure_index()
+        return list(self._by_letter.get(letter_grade, []))
+
+    def grades_between(
+        self,
+        start: Optional[Union[str, datetime.date]] = None,
+        end: Optional[Union[str, datetime.date]] = None
+    ) -> List[Assignment]:
+        """Returns grades dated within a range.
+
+        Parameters
+        ----------
+        start : Optional[Union[str, datetime.date]]
+            First date included, as "MM/DD/YYYY" or a date. If not given, the
+            range is unbounded below (the default is None).
+        end : Optional[Union[str, datetime.date]]
+            Last date included, as "MM/DD/YYYY" or a date. If not given, the
+            range is unbounded above (the default is None).
+
+        Returns
+        -------
+        List[Assignment]
+            Grades within the range, oldest first.
+
+        """
+        self._ensure_index()
+        low = 0
+        high = len(self._date_keys)
+        if start is not None:
+            low = bisect.bisect_left(self._date_keys, (date_ordinal(start), -1))
+        if end is not None:
+            high = bisect.bisect_left(self._date_keys, (date_ordinal(end) + 1, -1))
+        return self._date_grades[low:high]
 
     def sort_grades_by_date(self) -> None:
         """Sorts grades in order they appear in Skyward (most recent first).
@@ -69,11 +240,15 @@ class SkywardClass():
             The title Skyward gave to the class ("CLASS NAME (Period #) TEACHER NAME").
 
         """
-        return "{0} (Period {1}) {2}".format(
-            self.class_name,
-            self.period,
-            self.teacher
-        )
+        key = (self.class_name, self.period, self.teacher)
+        if key != self._title_key:
+            self._title = "{0} (Period {1}) {2}".format(
+                self.class_name,
+                self.period,
+                self.teacher
+            )
+            self._title_key = key
+        return self._title
 
     def grades_to_text(self) -> List[str]:
         """Converts the Assignment objects to their text representations.
@@ -142,10 +317,11 @@ class SkywardClass():
                 )
             )
         my_grades = self.grades
-        their_grades = other.grades
+        other._ensure_index()
+        their_grades = other._by_name
         diff_grades = [
             grade
-            for grade in my_grades if grade not in their_grades
+            for grade in my_grades if grade not in their_grades.get(grade.name, ())
         ]
         return SkywardClass(self.skyward_title(), diff_grades)
 
@@ -0,0 +1,325 @@
+"""Compact binary snapshots of Assignments and SkywardClasses.
+
+A snapshot is a little-endian header followed by a string table, a float
+table and a stream of 32-bit words describing the objects::
+
+    header   "SKYW", version, kind, string count, string bytes,
+             float count, word count
+    strings  one uint32 length per string, then the UTF-8 bytes
+    floats   float64 values
+    words    uint32 values
+
+Repeated strings (class names, teachers, letter grades, ...) are stored once.
+Point values and dates are stored as tagged words: the low two bits say
+whether the rest is a string index, a small integer, a float index or a
+date ordinal. Values that would not round-trip exactly are stored as
+strings, so ``loads(dumps(x)) == x`` always holds.
+"""
+import array
+import datetime
+import struct
+import sys
+from typing import Any, Dict, List, Union
+from skyward_api.assignment import Assignment
+from skyward_api.gradebook import Gradebook
+from skyward_api.intern import intern
+from skyward_api.skyward_class import SkywardClass, date_ordinal
+
+MAGIC = b"SKYW"
+VERSION = 1
+
+KIND_ASSIGNMENT = 0
+KIND_CLASS = 1
+KIND_CLASS_LIST = 2
+KIND_GRADEBOOK = 3
+
+_HEADER = struct.Struct("<4sBBIIII")
+
+_TAG_STRING = 0
+_TAG_INT = 1
+_TAG_FLOAT = 2
+_TAG_DATE = 3
+_MAX_PAYLOAD = 1 << 30
+
+Snapshotable = Union[Assignment, SkywardClass, List[SkywardClass], Gradebook]
+
+class _Encoder():
+    def __init__(self) -> None:
+        self.strings = {} # type: Dict[str, int]
+        self.floats = {} # type: Dict[str, int]
+        self.values = {} # type: Dict[str, int]
+        self.dates = {} # type: Dict[str, int]
+        self.words = array.array("I")
+
+    def string(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings[value] = index
+        return index
+
+    def tagged_string(self, value: str) -> int:
+        index = self.string(value)
+        if index >= _MAX_PAYLOAD:
+            raise ValueError("Too many distinct strings for a snapshot.")
+        return index << 2 | _TAG_STRING
+
+    def points(self, value: str) -> int:
+        word = self.values.get(value)
+        if word is None:
+            word = self._points(value)
+            self.values[value] = word
+        return word
+
+    def _points(self, value: str) -> int:
+        if value.isdecimal() and str(int(value)) == value and int(value) < _MAX_PAYLOAD:
+            return int(value) << 2 | _TAG_INT
+        try:
+            number = float(value)
+        except ValueError:
+            return self.tagged_string(value)
+        if repr(number) != value:
+            return self.tagged_string(value)
+        index = self.floats.get(value)
+        if index is None:
+            index = len(self.floats)
+            self.floats[value] = index
+        return index << 2 | _TAG_FLOAT
+
+    def date(self, value: str) -> int:
+        word = self.dates.get(value)
+        if word is None:
+            word = self._date(value)
+            self.dates[value] = word
+        return word
+
+    def _date(self, value: str) -> int:
+        try:
+            ordinal = date_ordinal(value)
+        except ValueError:
+            return self.tagged_string(value)
+        if datetime.date.fromordinal(ordinal).strftime("%m/%d/%Y") != value:
+            return self.tagged_string(value)
+        return ordinal << 2 | _TAG_DATE
+
+    def assignment(self, grade: Assignment) -> None:
+        values = self.values
+        dates = self.dates
+        self.words.extend((
+            self.string(grade.name),
+            values.get(grade.num_points) or self.points(grade.num_points),
+            values.get(grade.total_points) or self.points(grade.total_points),
+            self.string(grade.letter_grade),
+            dates.get(grade.date) or self.date(grade.date)
+        ))
+
+    def sky_class(self, sky_class: SkywardClass) -> None:
+        if not isinstance(sky_class.period, int) or not 0 <= sky_class.period < 1 << 32:
+            raise ValueError(
+                "Period {0!r} cannot be stored in a snapshot.".format(sky_class.period)
+            )
+        self.words.extend((
+            self.string(sky_class.class_name),
+            sky_class.period,
+            self.string(sky_class.teacher),
+            len(sky_class.grades)
+        ))
+        for grade in sky_class.grades:
+            self.assignment(grade)
+
+    def to_bytes(self, kind: int) -> bytes:
+        encoded = [string.encode("utf-8") for string in self.strings]
+        lengths = array.array("I", [len(string) for string in encoded])
+        floats = array.array("d", [float(number) for number in self.floats])
+        words = self.words
+        if sys.byteorder == "big":
+            for values in (lengths, floats, words):
+                values.byteswap()
+        string_bytes = b"".join(encoded)
+        header = _HEADER.pack(
+            MAGIC,
+            VERSION,
+            kind,
+            len(encoded),
+            len(string_bytes),
+            len(floats),
+            len(words)
+        )
+        return b"".join((
+            header,
+            lengths.tobytes(),
+            string_bytes,
+            floats.tobytes(),
+            words.tobytes()
+        ))
+
+class _Decoder():
+    def __init__(self, data: bytes) -> None:
+        if len(data) < _HEADER.size:
+            raise ValueError("Data is too short to be a snapshot.")
+        (
+            magic,
+            version,
+            kind,
+            n_strings,
+            n_string_bytes,
+            n_floats,
+            n_words
+        ) = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Data is not a SkywardAPI snapshot.")
+        if version != VERSION:
+            raise ValueError("Unsupported snapshot version {0}.".format(version))
+        self.kind = kind
+
+        offset = _HEADER.size
+        lengths = array.array("I")
+        floats = array.array("d")
+        self.words = array.array("I")
+        try:
+            lengths.frombytes(data[offset:offset + 4 * n_strings])
+            offset += 4 * n_strings
+            string_bytes = data[offset:offset + n_string_bytes]
+            offset += n_string_bytes
+            floats.frombytes(data[offset:offset + 8 * n_floats])
+            offset += 8 * n_floats
+            self.words.frombytes(data[offset:offset + 4 * n_words])
+        except ValueError:
+            raise ValueError("Snapshot is truncated.")
+        if len(self.words) != n_words or len(string_bytes) != n_string_bytes:
+            raise ValueError("Snapshot is truncated.")
+        if sys.byteorder == "big":
+            for values in (lengths, floats, self.words):
+                values.byteswap()
+
+        self.strings = [] # type: List[str]
+        start = 0
+        for length in lengths:
+            self.strings.append(
+                intern(string_bytes[start:start + length].decode("utf-8"))
+            )
+            start += length
+        self.floats = [intern(repr(number)) for number in floats]
+        self.values = {} # type: Dict[int, str]
+        self.position = 0
+
+    def value(self, word: int) -> str:
+        value = self.values.get(word)
+        if value is None:
+            value = self._value(word)
+            self.values[word] = value
+        return value
+
+    def _value(self, word: int) -> str:
+        tag = word & 3
+        payload = word >> 2
+        if tag == _TAG_STRING:
+            return self.strings[payload]
+        if tag == _TAG_INT:
+            return intern(str(payload))
+        if tag == _TAG_FLOAT:
+            return self.floats[payload]
+        return intern(datetime.date.fromordinal(payload).strftime("%m/%d/%Y"))
+
+    def assignment(self) -> Assignment:
+        position = self.position
+        name, num_points, total_points, letter_grade, date = (
+            self.words[position:position + 5]
+        )
+        self.position = position + 5
+        values = self.values
+        grade = Assignment.__new__(Assignment)
+        grade.__dict__ = {
+            "name": self.strings[name],
+            "num_points": values.get(num_points) or self.value(num_points),
+            "total_points": values.get(total_points) or self.value(total_points),
+            "letter_grade": self.strings[letter_grade],
+            "date": values.get(date) or self.value(date)
+        }
+        return grade
+
+    def sky_class(self) -> SkywardClass:
+        position = self.position
+        class_name, period, teacher, n_grades = self.words[position:position + 4]
+        self.position = position + 4
+        grades = [self.assignment() for _ in range(n_grades)]
+        return SkywardClass.from_parts(
+            self.strings[class_name],
+            period,
+            self.strings[teacher],
+            grades
+        )
+
+def dumps(obj: Snapshotable) -> bytes:
+    """Serializes grades to a compact binary snapshot.
+
+    Parameters
+    ----------
+    obj : Union[Assignment, SkywardClass, List[SkywardClass], Gradebook]
+        Grades to serialize.
+
+    Returns
+    -------
+    bytes
+        Snapshot of obj.
+
+    Raises
+    -------
+    ValueError
+        obj is not of a supported type, or a class period is not an integer
+        from 0 to 2**32 - 1.
+
+    """
+    encoder = _Encoder()
+    if isinstance(obj, Assignment):
+        kind = KIND_ASSIGNMENT
+        encoder.assignment(obj)
+    elif isinstance(obj, SkywardClass):
+        kind = KIND_CLASS
+        encoder.sky_class(obj)
+    elif isinstance(obj, (list, Gradebook)):
+        kind = KIND_GRADEBOOK if isinstance(obj, Gradebook) else KIND_CLASS_LIST
+        encoder.words.append(len(obj))
+        for sky_class in obj:
+            if not isinstance(sky_class, SkywardClass):
+                raise ValueError("Lists in snapshots may only hold SkywardClasses.")
+            encoder.sky_class(sky_class)
+    else:
+        raise ValueError("Cannot snapshot {0}.".format(type(obj).__name__))
+    return encoder.to_bytes(kind)
+
+def loads(data: bytes) -> Any:
+    """Rebuilds grades from a snapshot made by dumps.
+
+    Parameters
+    ----------
+    data : bytes
+        Snapshot to load.
+
+    Returns
+    -------
+    Union[Assignment, SkywardClass, List[SkywardClass], Gradebook]
+        Grades equal to the ones that were dumped.
+
+    Raises
+    -------
+    ValueError
+        data is not a valid snapshot or has an unsupported version.
+
+    """
+    decoder = _Decoder(data)
+    try:
+        if decoder.kind == KIND_ASSIGNMENT:
+            return decoder.assignment()
+        if decoder.kind == KIND_CLASS:
+            return decoder.sky_class()
+        if decoder.kind in (KIND_CLASS_LIST, KIND_GRADEBOOK):
+            n_classes = decoder.words[0]
+            decoder.position = 1
+            classes = [decoder.sky_class() for _ in range(n_classes)]
+            if decoder.kind == KIND_GRADEBOOK:
+                return Gradebook(classes)
+            return classes
+    except (IndexError, ValueError):
+        raise ValueError("Snapshot is corrupt.")
+    raise ValueError("Unknown snapshot kind {0}.".format(decoder.kind))
@@ -0,0 +1,273 @@
+import abc
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict, Optional
+import threading
+from requests_html import HTML
+import requests
+
+class Transport(abc.ABC):
+    """Way of sending the HTTP requests SkywardAPI.timed_request makes.
+
+    Transports raise requests' ConnectionError and Timeout so timed_request
+    can retry them the same way regardless of the client underneath.
+
+    Attributes
+    ----------
+    max_concurrency : int
+        Number of requests an api may have in flight at once through this
+        transport. get_grades fetches classes in parallel when above 1.
+
+    """
+    max_concurrency = 1
+
+    @abc.abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        data: Dict[str, Any],
+        headers: Dict[str, str],
+        params: Dict[str, str],
+        timeout: Optional[float]
+    ) -> Any:
+        """Sends a request.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method.
+        url : str
+            URL for request.
+        data : Dict[str, Any]
+            Form data for request.
+        headers : Dict[str, str]
+            Headers for request.
+        params : Dict[str, str]
+            Query params for request.
+        timeout : Optional[float]
+            Seconds to wait for the response, or None to wait forever.
+
+        Returns
+        -------
+        Any
+            Response with text and html attributes, like HTMLResponse.
+
+        Raises
+        -------
+        requests.exceptions.ConnectionError
+            Unable to connect.
+        requests.exceptions.Timeout
+            No response within timeout.
+
+        """
+
+    def close(self) -> None:
+        """Releases the transport's connections."""
+
+class SessionTransport(Transport):
+    """Sends requests with the api's HTMLSession, recycling it after each one.
+
+    This is the original SkywardAPI behaviour: HTTP/1.1, and a fresh session
+    (and so a fresh connection) per request.
+
+    Parameters
+    ----------
+    api : SkywardAPI
+        Api whose session is used.
+
+    """
+    def __init__(self, api: Any) -> None:
+        self.api = api
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        data: Dict[str, Any],
+        headers: Dict[str, str],
+        params: Dict[str, str],
+        timeout: Optional[float]
+    ) -> Any:
+        try:
+            return self.api.session.request(
+                method,
+                url,
+                data=data,
+                headers=headers,
+                params=params,
+                timeout=timeout
+            )
+        finally:
+            self.api.session.close()
+            self.api.session = self.api.new_session()
+
+class HTTP2Response():
+    """Response from HTTP2Transport with the parts of HTMLResponse SkywardAPI uses.
+
+    Parameters
+    ----------
+    response : httpx.Response
+        Response to wrap.
+
+    Attributes
+    ----------
+    url : str
+        Final URL of the response.
+    status_code : int
+        HTTP status code.
+    headers : Dict[str, str]
+        Response headers.
+    content : bytes
+        Raw body.
+    text : str
+        Decoded body.
+
+    """
+    def __init__(self, response: Any) -> None:
+        self.url = str(response.url)
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.content = response.content
+        self.text = response.text
+        self._html = None # type: Optional[HTML]
+
+    @property
+    def html(self) -> HTML:
+        if self._html is None:
+            self._html = HTML(url=self.url, html=self.text)
+        return self._html
+
+class HTTP2Transport(Transport):
+    """Sends requests over HTTP/2 with httpx, multiplexed on one connection per host.
+
+    The client is kept open between requests and may be shared by many apis
+    (and threads), so all their requests to Skyward share a connection. Like
+    the session transport, it never keeps cookies between requests, so apis
+    of different accounts sharing it cannot see each other's cookies.
+    Requires the optional ``httpx[http2]`` dependency.
+
+    Parameters
+    ----------
+    max_concurrency : int
+        Requests an api may have in flight at once (the default is 8).
+    verify : bool
+        Whether to verify TLS certificates (the default is True).
+
+    Raises
+    -------
+    ImportError
+        httpx with HTTP/2 support is not installed.
+
+    """
+    def __init__(self, max_concurrency: int = 8, verify: bool = True) -> None:
+        try:
+            import httpx
+            import h2
+        except ImportError:
+            raise ImportError(
+                "HTTP2Transport needs httpx with HTTP/2 support: "
+                "pip install 'httpx[http2]'"
+            )
+        self._httpx = httpx
+        self.max_concurrency = max_concurrency
+        self.client = httpx.Client(
+            http2=True,
+            cookies=CookieJar(DefaultCookiePolicy(allowed_domains=[])),
+            verify=verify,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        data: Dict[str, Any],
+        headers: Dict[str, str],
+        params: Dict[str, str],
+        timeout: Optional[float]
+    ) -> Any:
+        httpx = self._httpx
+        try:
+            response = self.client.request(
+                method.upper(),
+                url,
+                data=data or None,
+                headers=headers,
+                params=params,
+                timeout=timeout
+            )
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e))
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+        return HTTP2Response(response)
+
+    def close(self) -> None:
+        self.client.close()
+
+TRANSPORTS = {
+    "session": SessionTransport,
+    "http2": HTTP2Transport
+}
+
+_shared_http2 = None # type: Optional[HTTP2Transport]
+_shared_http2_lock = threading.Lock()
+
+def shared_http2_transport() -> HTTP2Transport:
+    """Returns the HTTP2Transport used by every api built with transport="http2".
+
+    It is created on first use and kept open for the life of the process, so
+    all those apis share one client and one connection per host.
+
+    Returns
+    -------
+    HTTP2Transport
+        The shared transport.
+
+    Raises
+    -------
+    ImportError
+        httpx with HTTP/2 support is not installed.
+
+    """
+    global _shared_http2
+    with _shared_http2_lock:
+        if _shared_http2 is None:
+            _shared_http2 = HTTP2Transport()
+        return _shared_http2
+
+def make_transport(transport: Any, api: Any) -> Transport:
+    """Resolves the transport option of SkywardAPI.
+
+    Parameters
+    ----------
+    transport : Union[str, Transport]
+        "session", "http2" (the shared_http2_transport()) or a Transport
+        instance.
+    api : SkywardAPI
+        Api the transport is for.
+
+    Returns
+    -------
+    Transport
+        Transport to send the api's requests with.
+
+    Raises
+    -------
+    ValueError
+        transport is not a known name or a Transport.
+
+    """
+    if isinstance(transport, Transport):
+        return transport
+    if transport == "session":
+        return SessionTransport(api)
+    if transport == "http2":
+        return shared_http2_transport()
+    raise ValueError(
+        "Unknown transport {0!r}; use one of {1} or a Transport.".format(
+            transport,
+            ", ".join(sorted(TRANSPORTS))
+        )
+    )
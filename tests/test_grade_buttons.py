@@ -0,0 +1,60 @@
+from typing import Dict, List
+from requests_html import HTML
+from skyward_api.grade_buttons import GradeButtonIndex, REQUIRED_ATTRS
+
+def button(lit: str, number: int, quote: str = '"') -> str:
+    return (
+        "<a id={q}showGradeInfo{q} data-lit={q}{lit}{q} data-cni={q}{n}{q} "
+        "data-gid={q}g{n}{q} data-sid={q}s{n}{q} data-sec={q}{n}{q} "
+        "data-eid={q}e{n}{q} href={q}#{q}>{lit}</a>"
+    ).format(q=quote, lit=lit, n=number)
+
+PAGE = """<html><head>
+<title>Gradebook <a id='showGradeInfo' data-lit='SM1'></a></title>
+<style>a[id="showGradeInfo"] {{ color: red; }}</style>
+<script type="text/javascript">
+var template = "<a id='showGradeInfo' data-lit='SM1'>";
+var other = '{script_button}';
+</script>
+</head><body>
+<!-- <a id='showGradeInfo' data-lit='SM1'>old</a> -->
+<table>
+<tr><td>{b0}</td><td>{b1}</td></tr>
+<tr><td>{b2}</td><td><a id="showGradeInfoLink" data-lit="SM1">x</a></td></tr>
+<tr><td><a id="showGradeInfo" data-lit="SM2" data-cni="9">incomplete</a></td></tr>
+<tr><td>{b3}</td></tr>
+</table>
+<SCRIPT>document.write("<a id=showGradeInfo data-lit=SM2>")</SCRIPT>
+</body></html>
+""".format(
+    script_button=button("SM1", 90, '"'),
+    b0=button("SM1", 0),
+    b1=button("SM2", 1, "'"),
+    b2=button("SM1", 2),
+    b3=button("SM2", 3)
+)
+
+def button_data(attrs_list: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    return [
+        {name: value for name, value in attrs.items() if name.startswith("data-")}
+        for attrs in attrs_list
+    ]
+
+def test_index_matches_dom_find() -> None:
+    dom = [
+        dict(element.attrs)
+        for element in HTML(html=PAGE).find("#showGradeInfo")
+        if all(name in element.attrs for name in REQUIRED_ATTRS)
+    ]
+    index = GradeButtonIndex.from_html(PAGE)
+    assert button_data([button.attrs for button in index.buttons]) == button_data(dom)
+    assert [button.attrs["data-gid"] for button in index.buttons] == \
+        ["g0", "g1", "g2", "g3"]
+    assert [button.attrs["data-gid"] for button in index.bucket("SM1")] == ["g0", "g2"]
+    assert [button.attrs["data-gid"] for button in index.bucket("SM2")] == ["g1", "g3"]
+
+def test_unterminated_comment_hides_rest_of_page() -> None:
+    page = button("SM1", 0) + "<!-- " + button("SM1", 1)
+    index = GradeButtonIndex.from_html(page)
+    assert [button.attrs["data-gid"] for button in index.buttons] == ["g0"]
+    assert len(GradeButtonIndex.from_html("<p>no buttons</p>")) == 0
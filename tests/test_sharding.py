@@ -0,0 +1,201 @@
+import time
+from typing import Any, Dict, List, Optional
+import pytest
+from skyward_api.API import SkywardAPI
+from skyward_api.scheduler import PollScheduler
+from skyward_api.sharding import HashRing, ShardCoordinator, SQLiteLeaseBackend
+
+class FakeAPI():
+    def __init__(self, username: str) -> None:
+        self.session_params = {"sessid": username, "encses": username}
+        self.polls = 0
+
+    def get_grades(self) -> List[Any]:
+        self.polls += 1
+        return []
+
+class Clock():
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def logins(monkeypatch: Any) -> Dict[str, Any]:
+    """Replaces logging in and resuming with FakeAPIs; usernames in "fail" raise."""
+    state = {"calls": [], "resumed": [], "fail": set(), "apis": {}} # type: Dict[str, Any]
+
+    def from_username_password(username: str, password: str, service: str,
+                               **options: Any) -> FakeAPI:
+        state["calls"].append(username)
+        if username in state["fail"]:
+            raise ValueError("Incorrect username or password")
+        state["apis"][username] = FakeAPI(username)
+        return state["apis"][username]
+
+    def from_session_data(service: str, sky_data: Dict[str, str],
+                          **options: Any) -> FakeAPI:
+        state["resumed"].append(sky_data["sessid"])
+        return FakeAPI(sky_data["sessid"])
+
+    monkeypatch.setattr(SkywardAPI, "from_username_password",
+                        staticmethod(from_username_password))
+    monkeypatch.setattr(SkywardAPI, "from_session_data",
+                        staticmethod(from_session_data))
+    return state
+
+def make_accounts(n: int) -> Dict[str, Dict[str, Any]]:
+    return {
+        "a{0}".format(number): {
+            "service": "test",
+            "username": "a{0}".format(number),
+            "password": "p"
+        }
+        for number in range(n)
+    }
+
+def make_scheduler(
+    clock: Any = time.monotonic,
+    errors: Optional[List[str]] = None
+) -> PollScheduler:
+    """Returns a scheduler that records the keys of failed polls in errors."""
+    failed = errors if errors is not None else []
+    return PollScheduler(
+        lambda change: None,
+        on_error=lambda key, error: failed.append(key),
+        clock=clock
+    )
+
+def test_ring_is_stable_and_moves_few_keys() -> None:
+    keys = ["a{0}".format(number) for number in range(1000)]
+    ring = HashRing(["n1", "n2", "n3"])
+    assert [ring.node_for(key) for key in keys] == \
+        [HashRing(["n3", "n1", "n2"]).node_for(key) for key in keys]
+    assert {ring.node_for(key) for key in keys} == {"n1", "n2", "n3"}
+
+    grown = HashRing(["n1", "n2", "n3", "n4"])
+    moved = [key for key in keys if ring.node_for(key) != grown.node_for(key)]
+    assert all(grown.node_for(key) == "n4" for key in moved)
+    assert len(moved) < len(keys) / 2
+    assert HashRing([]).node_for("a0") is None
+
+def test_leases_expire_and_release() -> None:
+    clock = Clock()
+    backend = SQLiteLeaseBackend(":memory:", clock=clock)
+    assert backend.acquire("a0", "n1", 30)
+    assert backend.acquire("a0", "n1", 30)
+    assert not backend.acquire("a0", "n2", 30)
+    assert backend.owner("a0") == "n1"
+
+    clock.now += 31
+    assert backend.owner("a0") is None
+    assert backend.acquire("a0", "n2", 30)
+
+    backend.release("a0", "n1")
+    assert backend.owner("a0") == "n2"
+    backend.release("a0", "n2")
+    assert backend.acquire("a0", "n1", 30)
+
+def test_nodes_split_accounts(logins: Dict[str, Any]) -> None:
+    backend = SQLiteLeaseBackend(":memory:")
+    accounts = make_accounts(20)
+    nodes = [
+        ShardCoordinator(name, backend, accounts, scheduler=make_scheduler())
+        for name in ("n1", "n2")
+    ]
+    for node in nodes:
+        node.rebalance()
+    # n1 took everything before n2 joined; it hands accounts over once it
+    # sees n2, and n2 picks them up on its next rebalance.
+    for node in nodes:
+        node.rebalance()
+
+    owned = [set(node.owned()) for node in nodes]
+    assert not owned[0] & owned[1]
+    assert owned[0] | owned[1] == set(accounts)
+    for node, accounts_owned in zip(nodes, owned):
+        assert node.scheduler is not None
+        assert set(node.scheduler.students) == accounts_owned
+        # Logins wait for the first poll.
+        assert set(node.apis) <= accounts_owned
+        node.scheduler.run_pending()
+        assert set(node.apis) == accounts_owned
+    assert logins["resumed"] == []
+
+def test_rebalance_does_not_log_in(logins: Dict[str, Any]) -> None:
+    backend = SQLiteLeaseBackend(":memory:")
+    scheduler = make_scheduler()
+    node = ShardCoordinator("n1", backend, make_accounts(5), scheduler=scheduler)
+    gained, lost = node.rebalance()
+    assert len(gained) == 5
+    assert logins["calls"] == []
+    assert scheduler.run_pending() == 5
+    assert sorted(logins["calls"]) == ["a0", "a1", "a2", "a3", "a4"]
+    assert backend.load_session("a0") == {"sessid": "a0", "encses": "a0"}
+
+def test_polls_stop_when_lease_lapses(logins: Dict[str, Any]) -> None:
+    backend = SQLiteLeaseBackend(":memory:")
+    scheduler = make_scheduler()
+    node = ShardCoordinator("n1", backend, make_accounts(1), ttl=0.2,
+                            scheduler=scheduler)
+    node.rebalance()
+    scheduler.run_pending()
+    api = logins["apis"]["a0"] # type: FakeAPI
+    assert "a0" in node.apis
+    assert api.polls == 1
+
+    # Another node takes the account while n1 is busy and not rebalancing.
+    time.sleep(0.3)
+    assert backend.acquire("a0", "n2", 30)
+    assert scheduler.poll("a0") == []
+    assert api.polls == 1
+
+    api.session_params = {"sessid": "stale", "encses": "stale"}
+    backend_session = {"sessid": "n2", "encses": "n2"}
+    assert backend.store_session("a0", backend_session, "n2")
+    node.rebalance()
+    assert "a0" not in scheduler.students
+    assert backend.load_session("a0") == backend_session
+
+def test_failed_login_is_retried(logins: Dict[str, Any]) -> None:
+    clock = Clock()
+    backend = SQLiteLeaseBackend(":memory:")
+    errors = [] # type: List[str]
+    scheduler = make_scheduler(clock, errors)
+    node = ShardCoordinator("n1", backend, make_accounts(4), scheduler=scheduler)
+    logins["fail"].add("a1")
+
+    gained, lost = node.rebalance()
+    assert sorted(gained) == ["a0", "a1", "a2", "a3"]
+    assert lost == []
+    assert scheduler.run_pending() == 4
+    assert errors == ["a1"]
+    assert sorted(node.apis) == ["a0", "a2", "a3"]
+    assert sorted(scheduler.students) == ["a0", "a1", "a2", "a3"]
+    assert node.owned() == ["a0", "a1", "a2", "a3"]
+
+    logins["fail"].clear()
+    assert node.rebalance() == ([], [])
+    clock.now += scheduler.initial_interval
+    scheduler.run_pending()
+    assert sorted(node.apis) == ["a0", "a1", "a2", "a3"]
+    assert logins["calls"].count("a1") == 2
+
+def test_leave_hands_sessions_over(logins: Dict[str, Any]) -> None:
+    backend = SQLiteLeaseBackend(":memory:")
+    accounts = make_accounts(3)
+    first = ShardCoordinator("n1", backend, accounts, scheduler=make_scheduler())
+    first.rebalance()
+    assert first.scheduler is not None
+    first.scheduler.run_pending()
+    first.leave()
+    assert backend.live_nodes() == []
+    assert backend.load_session("a0") == {"sessid": "a0", "encses": "a0"}
+
+    second = ShardCoordinator("n2", backend, accounts, scheduler=make_scheduler())
+    second.rebalance()
+    assert second.scheduler is not None
+    second.scheduler.run_pending()
+    assert sorted(logins["resumed"]) == ["a0", "a1", "a2"]
+    assert logins["calls"].count("a0") == 1